@@ -0,0 +1,69 @@
+"""Custo de decodificar o JWT com e sem o cache de tokens verificados.
+
+Uso (com as variáveis do `.env` carregadas):
+
+    python -m benchmarks.bench_jwt_decode --tokens 1000
+
+Mostra o custo por chamada e quanto de um core seria gasto só com
+decode a 10k rps por worker.
+"""
+
+import argparse
+import timeit
+
+from jwt import decode
+
+from fast_zero.auth.security import (
+    create_access_token,
+    decode_access_token,
+    key_ring,
+    settings,
+    token_cache,
+)
+
+RPS = 10_000
+
+
+def report(label: str, seconds_per_call: float):
+    core_share = seconds_per_call * RPS * 100
+    print(
+        f'{label:>12}: {seconds_per_call * 1_000_000:8.2f}us/call '
+        f'{core_share:6.1f}% de um core a {RPS} rps'
+    )
+
+
+def main(tokens: int, number: int):
+    pool = [
+        create_access_token(data={'sub': f'user{n}@email.com', 'uid': n})[0]
+        for n in range(tokens)
+    ]
+
+    def jwt_decode():
+        for token in pool:
+            decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+    def key_ring_decode():
+        for token in pool:
+            key_ring.decode(token)
+
+    def cached_decode():
+        for token in pool:
+            decode_access_token(token)
+
+    calls = tokens * number
+    report('jwt.decode', timeit.timeit(jwt_decode, number=number) / calls)
+    report('key ring', timeit.timeit(key_ring_decode, number=number) / calls)
+
+    token_cache.clear()
+    cached_decode()
+    report('memo cache', timeit.timeit(cached_decode, number=number) / calls)
+    print(f'hits={token_cache.hits} misses={token_cache.misses}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tokens', type=int, default=1000)
+    parser.add_argument('--number', type=int, default=20)
+    args = parser.parse_args()
+
+    main(args.tokens, args.number)
@@ -0,0 +1,153 @@
+"""Latência de `GET /todos` enquanto uma rajada de logins está em execução.
+
+Uso (com a API rodando, ex: `task run` ou `docker compose up`):
+
+    LOGIN_IP_BURST=1000000 LOGIN_IP_PER_MINUTE=1000000 \\
+    LOGIN_EMAIL_BURST=1000000 LOGIN_EMAIL_PER_MINUTE=1000000 task run
+
+    python benchmarks/bench_login_storm.py --base-url http://localhost:8000 \\
+        --users 64
+
+Todos os logins da rajada saem do mesmo IP: sem subir os limites do
+rate limiter a API responde 429 antes de calcular o argon2 e a rajada não
+mede nada. Os logins são espalhados entre `--users` emails e a contagem de
+status da rajada é mostrada no final para conferir.
+
+Compare o p99 com `PASSWORD_HASH_WORKERS`/`PASSWORD_HASH_EXECUTOR`
+diferentes para ver o efeito de tirar o argon2 do event loop.
+"""
+
+import argparse
+import asyncio
+import itertools
+import statistics
+import time
+from collections import Counter
+from http import HTTPStatus
+
+import httpx
+
+USERNAME = 'bench_login_storm'
+EMAIL = 'bench_login_storm@email.com'
+PASSWORD = 'bench@123'
+
+
+async def get_token(client: httpx.AsyncClient):
+    await client.post(
+        '/users/',
+        json={'username': USERNAME, 'email': EMAIL, 'password': PASSWORD},
+    )
+    response = await client.post(
+        '/auth/token', data={'username': EMAIL, 'password': PASSWORD}
+    )
+    response.raise_for_status()
+
+    return response.json()['access_token']
+
+
+def storm_email(n: int):
+    return f'{USERNAME}{n}@email.com'
+
+
+async def create_storm_users(client: httpx.AsyncClient, users: int):
+    await asyncio.gather(
+        *(
+            client.post(
+                '/users/',
+                json={
+                    'username': f'{USERNAME}{n}',
+                    'email': storm_email(n),
+                    'password': PASSWORD,
+                },
+            )
+            for n in range(users)
+        )
+    )
+
+
+async def login_storm(
+    client: httpx.AsyncClient,
+    stop: asyncio.Event,
+    emails: itertools.cycle,
+    statuses: Counter,
+):
+    while not stop.is_set():
+        response = await client.post(
+            '/auth/token',
+            data={'username': next(emails), 'password': PASSWORD},
+        )
+        statuses[response.status_code] += 1
+
+
+async def probe_todos(client: httpx.AsyncClient, token: str, duration: float):
+    latencies = []
+    headers = {'Authorization': f'Bearer {token}'}
+    deadline = time.perf_counter() + duration
+
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        await client.get('/todos/', headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return latencies
+
+
+def report(label: str, latencies: list[float]):
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f'{label:>12}: n={len(latencies):<6} '
+        f'p50={quantiles[49]:7.1f}ms '
+        f'p95={quantiles[94]:7.1f}ms '
+        f'p99={quantiles[98]:7.1f}ms'
+    )
+
+
+def report_statuses(statuses: Counter):
+    counts = ' '.join(
+        f'{status}={count}' for status, count in sorted(statuses.items())
+    )
+    print(f'{"logins":>12}: {counts}')
+
+    if statuses[HTTPStatus.TOO_MANY_REQUESTS]:
+        print(
+            f'{"":>12}  respostas 429: suba LOGIN_IP_* e LOGIN_EMAIL_* '
+            'na API antes de comparar as latências'
+        )
+
+
+async def main(base_url: str, duration: float, concurrency: int, users: int):
+    limits = httpx.Limits(max_connections=concurrency + 1)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=60
+    ) as client:
+        token = await get_token(client)
+        await create_storm_users(client, users)
+
+        report('idle', await probe_todos(client, token, duration))
+
+        stop = asyncio.Event()
+        emails = itertools.cycle([storm_email(n) for n in range(users)])
+        statuses = Counter()
+        storm = [
+            asyncio.create_task(login_storm(client, stop, emails, statuses))
+            for _ in range(concurrency)
+        ]
+        latencies = await probe_todos(client, token, duration)
+        stop.set()
+        await asyncio.gather(*storm)
+
+        report('login storm', latencies)
+        report_statuses(statuses)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--base-url', default='http://localhost:8000')
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--users', type=int, default=64)
+    args = parser.parse_args()
+
+    asyncio.run(
+        main(args.base_url, args.duration, args.concurrency, args.users)
+    )
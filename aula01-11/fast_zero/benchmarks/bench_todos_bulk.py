@@ -0,0 +1,84 @@
+"""Vazão de criação de todos: `POST /todos` por item contra `POST /todos/bulk`.
+
+Uso (com a API rodando, ex: `task run` ou `docker compose up`):
+
+    python benchmarks/bench_todos_bulk.py --base-url http://localhost:8000 \\
+        --items 2000 --batch-size 100
+
+Cria os mesmos `--items` todos das duas formas e mostra itens/s de cada uma.
+O `--batch-size` não pode passar de `TODO_BULK_MAX_SIZE`.
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+USERNAME = 'bench_todos_bulk'
+EMAIL = 'bench_todos_bulk@email.com'
+PASSWORD = 'bench@123'
+
+
+async def get_token(client: httpx.AsyncClient):
+    await client.post(
+        '/users/',
+        json={'username': USERNAME, 'email': EMAIL, 'password': PASSWORD},
+    )
+    response = await client.post(
+        '/auth/token', data={'username': EMAIL, 'password': PASSWORD}
+    )
+    response.raise_for_status()
+
+    return response.json()['access_token']
+
+
+def make_todos(items: int):
+    return [
+        {'title': f'task {n}', 'description': 'bench', 'state': 'todo'}
+        for n in range(items)
+    ]
+
+
+async def create_one_by_one(client: httpx.AsyncClient, todos: list[dict]):
+    for todo in todos:
+        response = await client.post('/todos/', json=todo)
+        response.raise_for_status()
+
+
+async def create_in_bulk(
+    client: httpx.AsyncClient, todos: list[dict], batch_size: int
+):
+    for start in range(0, len(todos), batch_size):
+        response = await client.post(
+            '/todos/bulk', json=todos[start : start + batch_size]
+        )
+        response.raise_for_status()
+
+
+async def main(base_url: str, items: int, batch_size: int):
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        token = await get_token(client)
+        client.headers['Authorization'] = f'Bearer {token}'
+        todos = make_todos(items)
+
+        start = time.perf_counter()
+        await create_one_by_one(client, todos)
+        single = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await create_in_bulk(client, todos, batch_size)
+        bulk = time.perf_counter() - start
+
+    print(f'{"POST /todos":>16}: {items / single:9.1f} itens/s')
+    print(f'{"POST /todos/bulk":>16}: {items / bulk:9.1f} itens/s')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--base-url', default='http://localhost:8000')
+    parser.add_argument('--items', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=100)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.base_url, args.items, args.batch_size))
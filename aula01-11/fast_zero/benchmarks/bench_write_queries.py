@@ -0,0 +1,127 @@
+"""Round-trips por escrita com e sem o refresh depois do commit.
+
+Uso (com as variáveis do `.env` carregadas):
+
+    python -m benchmarks.bench_write_queries --number 200
+
+Por padrão roda num sqlite em memória. Com `--url` roda no banco indicado,
+criando as tabelas e deixando as linhas inseridas para trás.
+
+Para cada escrita mostra quantos statements chegam ao banco e o tempo médio,
+primeiro refazendo o `session.refresh` que os handlers faziam e depois só
+com o INSERT/UPDATE ... RETURNING dos modelos.
+"""
+
+import argparse
+import asyncio
+from time import perf_counter
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from fast_zero.database.tables import table_registry
+from fast_zero.todo.enums import TodoState
+from fast_zero.todo.models import Todo
+from fast_zero.user.models import User
+
+
+async def create_user(session: AsyncSession, n: int, refresh: bool):
+    user = User(
+        username=f'bench{n}-{refresh}',
+        email=f'bench{n}-{refresh}@email.com',
+        password='secret',
+    )
+    session.add(user)
+    await session.commit()
+    if refresh:
+        await session.refresh(user)
+
+    return user
+
+
+async def create_todo(session: AsyncSession, user: User, refresh: bool):
+    todo = Todo(
+        title='task',
+        description='bench',
+        state=TodoState.todo,
+        user_id=user.id,
+    )
+    session.add(todo)
+    await session.commit()
+    if refresh:
+        await session.refresh(todo)
+
+    return todo
+
+
+async def update_todo(session: AsyncSession, todo: Todo, refresh: bool):
+    todo.state = TodoState.done
+    await session.commit()
+    if refresh:
+        await session.refresh(todo)
+
+
+async def update_user(session: AsyncSession, user: User, refresh: bool):
+    user.password = 'new-secret'
+    await session.commit()
+    if refresh:
+        await session.refresh(user)
+
+
+async def main(url: str, number: int):
+    engine = create_async_engine(url)
+    statements = 0
+
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    async with engine.begin() as conn:
+        await conn.run_sync(table_registry.metadata.create_all)
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', count)
+
+    for refresh in (True, False):
+        label = 'commit + refresh' if refresh else 'RETURNING'
+        totals = dict.fromkeys(
+            ('create_user', 'create_todo', 'update_todo', 'update_user'),
+            (0, 0.0),
+        )
+
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            for n in range(number):
+                for name in totals:
+                    before, start = statements, perf_counter()
+
+                    if name == 'create_user':
+                        user = await create_user(session, n, refresh)
+                    elif name == 'create_todo':
+                        todo = await create_todo(session, user, refresh)
+                    elif name == 'update_todo':
+                        await update_todo(session, todo, refresh)
+                    else:
+                        await update_user(session, user, refresh)
+
+                    queries, seconds = totals[name]
+                    totals[name] = (
+                        queries + statements - before,
+                        seconds + perf_counter() - start,
+                    )
+
+        print(label)
+        for name, (queries, seconds) in totals.items():
+            print(
+                f'{name:>12}: {queries / number:4.1f} statements/op '
+                f'{seconds / number * 1000:7.3f}ms/op'
+            )
+
+    await engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--url', default='sqlite+aiosqlite:///:memory:')
+    parser.add_argument('--number', type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.url, args.number))
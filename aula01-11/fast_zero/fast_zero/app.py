@@ -1,10 +1,76 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from fast_zero.auth import router as auth
+from fast_zero.auth.revocation import rebuild_revocation_list
+from fast_zero.auth.security import password_hash_pool
+from fast_zero.auth.service import sweep_refresh_tokens
+from fast_zero.commons.tasks import run_periodically
+from fast_zero.database.cache import result_cache
+from fast_zero.database.config import database
 from fast_zero.todo import router as todos
+from fast_zero.todo.models import Todo
+from fast_zero.todo.service import archive_todos, sweep_tombstones
 from fast_zero.user import router as users
+from fast_zero.user.models import User
+from settings import settings
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    database.start(settings)
+    await database.warm_up(
+        min(settings.DB_POOL_MIN_CONNECTIONS, settings.DB_POOL_SIZE)
+    )
+
+    if settings.RESULT_CACHE_ENABLED:
+        result_cache.install(User, Todo)
+
+    # desligado nos testes: os jobs abririam o banco do .env, não o de teste
+    tasks = []
+    if settings.BACKGROUND_JOBS_ENABLED:
+        tasks = [
+            asyncio.create_task(
+                run_periodically(
+                    settings.REFRESH_TOKEN_SWEEP_INTERVAL_SECS,
+                    sweep_refresh_tokens,
+                )
+            ),
+            asyncio.create_task(
+                run_periodically(
+                    settings.REVOCATION_REBUILD_INTERVAL_SECS,
+                    rebuild_revocation_list,
+                    immediately=True,
+                )
+            ),
+            asyncio.create_task(
+                run_periodically(
+                    settings.TODO_ARCHIVE_INTERVAL_SECS, archive_todos
+                )
+            ),
+            asyncio.create_task(
+                run_periodically(
+                    settings.TODO_TOMBSTONE_SWEEP_INTERVAL_SECS,
+                    sweep_tombstones,
+                )
+            ),
+        ]
+
+    yield
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    result_cache.uninstall()
+    await database.stop()
+
+    password_hash_pool.shutdown()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(auth.router)
 app.include_router(users.router)
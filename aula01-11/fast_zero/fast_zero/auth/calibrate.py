@@ -0,0 +1,78 @@
+"""Calibra os parâmetros do argon2 para um orçamento de latência.
+
+Rode na máquina de destino (ex: `fly ssh console`):
+
+    python -m fast_zero.auth.calibrate --budget-ms 150 --max-memory-mib 32
+
+e copie as variáveis impressas para o ambiente da aplicação.
+"""
+
+import argparse
+import statistics
+from time import perf_counter
+
+from pwdlib.hashers.argon2 import Argon2Hasher
+
+MIN_MEMORY_MIB = 8
+
+
+def measure(time_cost: int, memory_cost: int, parallelism: int, rounds: int):
+    hasher = Argon2Hasher(
+        time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism
+    )
+    samples = []
+
+    for _ in range(rounds):
+        start = perf_counter()
+        hasher.hash('calibration password')
+        samples.append((perf_counter() - start) * 1000)
+
+    return statistics.median(samples)
+
+
+def calibrate(
+    budget_ms: float,
+    max_memory_mib: int,
+    parallelism: int = 1,
+    max_time_cost: int = 10,
+    rounds: int = 3,
+):
+    memory_mib = max_memory_mib
+
+    while True:
+        memory_cost = memory_mib * 1024
+        best = None
+
+        for time_cost in range(1, max_time_cost + 1):
+            elapsed = measure(time_cost, memory_cost, parallelism, rounds)
+            if elapsed > budget_ms:
+                break
+            best = (time_cost, memory_cost, parallelism, elapsed)
+
+        if best or memory_mib <= MIN_MEMORY_MIB:
+            return best or (1, memory_cost, parallelism, elapsed)
+
+        memory_mib = max(memory_mib // 2, MIN_MEMORY_MIB)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--budget-ms', type=float, default=150)
+    parser.add_argument('--max-memory-mib', type=int, default=32)
+    parser.add_argument('--parallelism', type=int, default=1)
+    parser.add_argument('--workers', type=int, default=2)
+    args = parser.parse_args()
+
+    time_cost, memory_cost, parallelism, elapsed = calibrate(
+        args.budget_ms, args.max_memory_mib, args.parallelism
+    )
+
+    print(f'# {elapsed:.1f}ms por hash')
+    print(f'# pico de memória: {memory_cost * args.workers // 1024} MiB')
+    print(f'ARGON2_TIME_COST={time_cost}')
+    print(f'ARGON2_MEMORY_COST={memory_cost}')
+    print(f'ARGON2_PARALLELISM={parallelism}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+from dataclasses import dataclass
+from typing import Any
+
+from jwt import PyJWK, decode, encode, get_unverified_header
+from jwt.algorithms import get_default_algorithms
+from jwt.exceptions import InvalidTokenError
+
+from settings import JWTKey, Settings
+
+DEFAULT_KID = 'default'
+
+
+@dataclass(frozen=True)
+class ParsedKey:
+    kid: str
+    algorithm: str
+    signing_key: Any
+    verifying_key: PyJWK
+
+
+def parse_key(key: JWTKey):
+    if key.algorithm == 'none':
+        raise ValueError(f'key {key.kid}: algorithm "none" is not allowed')
+
+    algorithm = get_default_algorithms().get(key.algorithm)
+    if algorithm is None:
+        raise ValueError(
+            f'key {key.kid}: algorithm {key.algorithm} is not available, '
+            'asymmetric algorithms require the cryptography package'
+        )
+
+    if key.secret is not None:
+        signing_key = algorithm.prepare_key(key.secret)
+        public_key = signing_key
+    else:
+        signing_key = (
+            algorithm.prepare_key(key.private_key) if key.private_key else None
+        )
+        public_key = (
+            algorithm.prepare_key(key.public_key)
+            if key.public_key
+            else signing_key.public_key()
+        )
+
+    verifying_key = PyJWK(
+        algorithm.to_jwk(public_key, as_dict=True), algorithm=key.algorithm
+    )
+
+    return ParsedKey(
+        kid=key.kid,
+        algorithm=key.algorithm,
+        signing_key=signing_key,
+        verifying_key=verifying_key,
+    )
+
+
+class KeyRing:
+    def __init__(self, keys: list[JWTKey], active_kid: str):
+        self.keys = {key.kid: parse_key(key) for key in keys}
+        self.active = self.keys.get(active_kid)
+
+        if self.active is None or self.active.signing_key is None:
+            raise ValueError(f'active key {active_kid} has no signing key')
+
+    @classmethod
+    def from_settings(cls, settings: Settings):
+        if not settings.JWT_KEYS:
+            default_key = JWTKey(
+                kid=DEFAULT_KID,
+                algorithm=settings.ALGORITHM,
+                secret=settings.SECRET_KEY,
+            )
+            return cls([default_key], DEFAULT_KID)
+
+        return cls(
+            settings.JWT_KEYS,
+            settings.JWT_ACTIVE_KID or settings.JWT_KEYS[0].kid,
+        )
+
+    def encode(self, payload: dict):
+        return encode(
+            payload,
+            self.active.signing_key,
+            algorithm=self.active.algorithm,
+            headers={'kid': self.active.kid},
+        )
+
+    def decode(self, token: str):
+        if len(self.keys) == 1:
+            return decode(
+                token,
+                self.active.verifying_key,
+                algorithms=[self.active.algorithm],
+            )
+
+        kid = get_unverified_header(token).get('kid', self.active.kid)
+
+        key = self.keys.get(kid) if isinstance(kid, str) else None
+        if key is None:
+            raise InvalidTokenError(f'unknown key id {kid}')
+
+        return decode(token, key.verifying_key, algorithms=[key.algorithm])
@@ -0,0 +1,159 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from http import HTTPStatus
+from math import ceil
+from time import time
+from typing import Protocol
+
+from fastapi import Request
+from fastapi.exceptions import HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from fast_zero.auth.models import RateLimitBucket
+from fast_zero.database.config import database
+from settings import settings
+
+
+def client_ip(request: Request):
+    if settings.CLIENT_IP_HEADER:
+        address = request.headers.get(settings.CLIENT_IP_HEADER)
+        if address:
+            return address.strip()
+
+    if settings.TRUSTED_PROXY_HOPS:
+        # cada proxy acrescenta quem conectou nele: só os últimos hops são
+        # confiáveis, o começo da lista vem do cliente e pode ser forjado
+        header = request.headers.get('x-forwarded-for', '')
+        forwarded = [
+            address.strip() for address in header.split(',') if address.strip()
+        ]
+        if len(forwarded) >= settings.TRUSTED_PROXY_HOPS:
+            return forwarded[-settings.TRUSTED_PROXY_HOPS]
+
+    return request.client.host if request.client else 'unknown'
+
+
+@dataclass(frozen=True)
+class Bucket:
+    capacity: int
+    refill_rate: float
+
+    def take(self, tokens: float, updated_at: float, now: float):
+        tokens = min(
+            self.capacity, tokens + (now - updated_at) * self.refill_rate
+        )
+
+        if tokens >= 1:
+            return tokens - 1, 0.0
+
+        return tokens, (1 - tokens) / self.refill_rate
+
+
+class BucketStore(Protocol):
+    async def take(self, key: str, bucket: Bucket) -> float: ...
+
+
+class MemoryBucketStore:
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+
+    async def take(self, key: str, bucket: Bucket):
+        now = time()
+        tokens, updated_at = self._buckets.get(key, (bucket.capacity, now))
+        tokens, retry_after = bucket.take(tokens, updated_at, now)
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+        return retry_after
+
+    def clear(self):
+        self._buckets.clear()
+
+
+class DatabaseBucketStore:
+    def __init__(self, engine: AsyncEngine | None = None):
+        self._engine = engine
+
+    @property
+    def engine(self):
+        # sem engine explícito usa o do lifespan, que só existe após o startup
+        return self._engine or database.engine
+
+    async def take(self, key: str, bucket: Bucket):
+        try:
+            return await self._take(key, bucket)
+        except IntegrityError:
+            # outra máquina criou o bucket ao mesmo tempo, tenta de novo
+            return await self._take(key, bucket)
+
+    async def _take(self, key: str, bucket: Bucket):
+        now = time()
+
+        async with AsyncSession(self.engine) as session, session.begin():
+            db_bucket = await session.get(
+                RateLimitBucket, key, with_for_update=True
+            )
+
+            if db_bucket is None:
+                db_bucket = RateLimitBucket(
+                    key=key, tokens=bucket.capacity, updated_at=now
+                )
+                session.add(db_bucket)
+
+            db_bucket.tokens, retry_after = bucket.take(
+                db_bucket.tokens, db_bucket.updated_at, now
+            )
+            db_bucket.updated_at = now
+
+        return retry_after
+
+
+class LoginRateLimiter:
+    def __init__(self, store: BucketStore, per_ip: Bucket, per_email: Bucket):
+        self.store = store
+        self.per_ip = per_ip
+        self.per_email = per_email
+
+    async def check(self, client_ip: str, email: str):
+        limits = (
+            (f'login:ip:{client_ip}', self.per_ip),
+            (f'login:email:{email.lower()}', self.per_email),
+        )
+
+        for key, bucket in limits:
+            retry_after = await self.store.take(key, bucket)
+
+            if retry_after:
+                raise HTTPException(
+                    status_code=HTTPStatus.TOO_MANY_REQUESTS,
+                    detail='Too many login attempts, try again later',
+                    headers={'Retry-After': str(ceil(retry_after))},
+                )
+
+
+def create_login_limiter():
+    if settings.LOGIN_RATE_LIMIT_STORE == 'database':
+        store = DatabaseBucketStore()
+    else:
+        store = MemoryBucketStore(max_keys=settings.LOGIN_RATE_LIMIT_MAX_KEYS)
+
+    return LoginRateLimiter(
+        store,
+        per_ip=Bucket(
+            capacity=settings.LOGIN_IP_BURST,
+            refill_rate=settings.LOGIN_IP_PER_MINUTE / 60,
+        ),
+        per_email=Bucket(
+            capacity=settings.LOGIN_EMAIL_BURST,
+            refill_rate=settings.LOGIN_EMAIL_PER_MINUTE / 60,
+        ),
+    )
+
+
+login_limiter = create_login_limiter()
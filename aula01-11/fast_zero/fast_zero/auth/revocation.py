@@ -0,0 +1,94 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fast_zero.auth.models import RevokedToken
+from fast_zero.commons.bloom import BloomFilter
+from fast_zero.commons.clock import utcnow
+from fast_zero.database.config import database
+from settings import settings
+
+
+class RevocationList:
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._filter: BloomFilter | None = None
+        self._added_while_rebuilding: list[str] | None = None
+
+    @property
+    def ready(self):
+        return self._filter is not None
+
+    def might_contain(self, jti: str):
+        # sem filtro ainda (startup ou falha no rebuild) tudo vai pro banco
+        return self._filter is None or jti in self._filter
+
+    def add(self, jti: str):
+        if self._filter is not None:
+            self._filter.add(jti)
+        if self._added_while_rebuilding is not None:
+            self._added_while_rebuilding.append(jti)
+
+    def clear(self):
+        self._filter = None
+        self._added_while_rebuilding = None
+
+    async def rebuild(self, session: AsyncSession):
+        self._added_while_rebuilding = []
+        try:
+            jtis = (
+                await session.scalars(
+                    select(RevokedToken.jti).where(
+                        RevokedToken.expires_at > utcnow()
+                    )
+                )
+            ).all()
+
+            bloom = BloomFilter(max(self.capacity, len(jtis)), self.error_rate)
+            for jti in [*jtis, *self._added_while_rebuilding]:
+                bloom.add(jti)
+
+            self._filter = bloom
+        finally:
+            self._added_while_rebuilding = None
+
+
+revocation_list = RevocationList(
+    capacity=settings.REVOCATION_BLOOM_CAPACITY,
+    error_rate=settings.REVOCATION_BLOOM_ERROR_RATE,
+)
+
+
+async def is_revoked(session: AsyncSession, jti: str):
+    if not revocation_list.might_contain(jti):
+        return False
+
+    revoked = await session.scalar(
+        select(RevokedToken.jti).where(RevokedToken.jti == jti)
+    )
+
+    return revoked is not None
+
+
+async def revoke_token(session: AsyncSession, jti: str, exp: int):
+    expires_at = datetime.fromtimestamp(exp, tz=ZoneInfo('UTC'))
+
+    await session.merge(
+        RevokedToken(jti=jti, expires_at=expires_at.replace(tzinfo=None))
+    )
+    await session.commit()
+
+    revocation_list.add(jti)
+
+
+async def rebuild_revocation_list():
+    async with AsyncSession(database.engine) as session:
+        await session.execute(
+            delete(RevokedToken).where(RevokedToken.expires_at <= utcnow())
+        )
+        await session.commit()
+
+        await revocation_list.rebuild(session)
@@ -1,17 +1,29 @@
 from http import HTTPStatus
 from typing import Annotated
+from uuid import uuid4
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from fastapi.exceptions import HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from fast_zero.auth.schemas import Token
+from fast_zero.auth.limiter import client_ip, login_limiter
+from fast_zero.auth.revocation import revoke_token
+from fast_zero.auth.schemas import RefreshTokenRequest, Token
 from fast_zero.auth.security import (
     create_access_token,
-    get_current_user,
-    verify_password,
+    credential_exception,
+    get_token_claims,
+    oauth2_schema,
+    token_cache,
+    token_cache_key,
+    verify_and_update_password_async,
+)
+from fast_zero.auth.service import (
+    issue_refresh_token,
+    revoke_refresh_token_family,
+    rotate_refresh_token,
 )
 from fast_zero.database.config import get_session
 from fast_zero.user.models import User
@@ -20,34 +32,75 @@ router = APIRouter(prefix='/auth', tags=['auth'])
 
 OAuth2Form = Annotated[OAuth2PasswordRequestForm, Depends()]
 Session = Annotated[AsyncSession, Depends(get_session)]
-CurrentUser = Annotated[User, Depends(get_current_user)]
+BearerToken = Annotated[str, Depends(oauth2_schema)]
+TokenClaims = Annotated[dict, Depends(get_token_claims)]
 
 
 @router.post('/token', status_code=HTTPStatus.OK, response_model=Token)
-async def login(form_data: OAuth2Form, session: Session):
+async def login(request: Request, form_data: OAuth2Form, session: Session):
+    await login_limiter.check(client_ip(request), form_data.username)
+
+    # fora do result cache: a invalidação é por processo, e um hash de senha
+    # antigo em outro worker continuaria aceitando a senha trocada
     user = await session.scalar(
         select(User).where(User.email == form_data.username)
     )
 
-    if not user or not verify_password(form_data.password, user.password):
+    valid, updated_hash = False, None
+    if user:
+        valid, updated_hash = await verify_and_update_password_async(
+            form_data.password, user.password
+        )
+
+    if not valid:
         raise HTTPException(
             status_code=HTTPStatus.UNAUTHORIZED,
             detail='Invalid username or password',
         )
 
-    token, expires_in = create_access_token(data={'sub': user.email})
+    if updated_hash:
+        user.password = updated_hash
+
+    family_id = uuid4().hex
+    refresh_token = issue_refresh_token(session, user.id, family_id)
+    await session.commit()
+
+    token, expires_in = create_access_token(
+        data={'sub': user.email, 'uid': user.id, 'fid': family_id}
+    )
 
     return Token(
         access_token=token,
         token_type='Bearer',
         expires_in=expires_in,
+        refresh_token=refresh_token,
     )
 
 
 @router.post('/refresh_token', status_code=HTTPStatus.OK, response_model=Token)
-def refresh_token(user: CurrentUser):
-    token, expires_in = create_access_token(data={'sub': user.email})
+async def refresh_token(refresh: RefreshTokenRequest, session: Session):
+    new_refresh_token, user_id, email, family_id = await rotate_refresh_token(
+        session, refresh.refresh_token
+    )
+    token, expires_in = create_access_token(
+        data={'sub': email, 'uid': user_id, 'fid': family_id}
+    )
 
     return Token(
-        access_token=token, token_type='Bearer', expires_in=expires_in
+        access_token=token,
+        token_type='Bearer',
+        expires_in=expires_in,
+        refresh_token=new_refresh_token,
     )
+
+
+@router.post('/logout', status_code=HTTPStatus.NO_CONTENT)
+async def logout(session: Session, token: BearerToken, claims: TokenClaims):
+    if not claims.get('jti'):
+        raise credential_exception()
+
+    # sem isso o refresh token da sessão continuaria emitindo access tokens
+    if claims.get('fid'):
+        await revoke_refresh_token_family(session, claims['fid'])
+    await revoke_token(session, claims['jti'], claims['exp'])
+    token_cache.pop(token_cache_key(token))
@@ -5,3 +5,8 @@ class Token(BaseModel):
     access_token: str
     token_type: str = 'Bearer'
     expires_in: int
+    refresh_token: str
+
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
@@ -1,28 +1,107 @@
+import asyncio
+import hashlib
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
 from datetime import datetime, timedelta
 from http import HTTPStatus
 from typing import Annotated
+from uuid import uuid4
 from zoneinfo import ZoneInfo
 
 from fastapi import Depends
 from fastapi.exceptions import HTTPException
 from fastapi.security import OAuth2PasswordBearer
-from jwt import decode, encode
 from jwt.exceptions import InvalidTokenError
 from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, make_transient_to_detached, raiseload
+from sqlalchemy.orm.attributes import set_committed_value
 
+from fast_zero.auth.keys import KeyRing
+from fast_zero.auth.revocation import is_revoked
+from fast_zero.commons.cache import TTLCache
 from fast_zero.database.config import get_session
 from fast_zero.user.models import User
 from settings import settings
 
-passwd_context = PasswordHash.recommended()
+passwd_context = PasswordHash((
+    Argon2Hasher(
+        time_cost=settings.ARGON2_TIME_COST,
+        memory_cost=settings.ARGON2_MEMORY_COST,
+        parallelism=settings.ARGON2_PARALLELISM,
+    ),
+))
+key_ring = KeyRing.from_settings(settings)
 oauth2_schema = OAuth2PasswordBearer(
     tokenUrl='/auth/token', refreshUrl='/auth/refresh_token'
 )
 
 Session = Annotated[AsyncSession, Depends(get_session)]
 
+PRINCIPAL_COLUMNS = ('id', 'username', 'email')
+
+principal_cache = TTLCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECS,
+)
+token_cache = TTLCache(
+    max_size=settings.TOKEN_CACHE_MAX_SIZE,
+    ttl=settings.TOKEN_TIME_EXPIRATION_SECS,
+)
+
+
+class PasswordHashPool:
+    def __init__(self, executor: str, workers: int, max_pending: int):
+        self.executor = executor
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self._pool: Executor | None = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            if self.executor == 'process':
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix='password-hash',
+                )
+
+        return self._pool
+
+    async def run(self, func, *args):
+        if self.pending >= self.max_pending:
+            raise HTTPException(
+                status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                detail='Server busy, try again later',
+                headers={'Retry-After': '1'},
+            )
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_pool(), func, *args)
+        finally:
+            self.pending -= 1
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+password_hash_pool = PasswordHashPool(
+    executor=settings.PASSWORD_HASH_EXECUTOR,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+
 
 def hash_password(plain_password: str):
     return passwd_context.hash(plain_password)
@@ -32,59 +111,164 @@ def verify_password(plain_password: str, hashed_password: str):
     return passwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str):
+    return passwd_context.verify_and_update(plain_password, hashed_password)
+
+
+async def hash_password_async(plain_password: str):
+    return await password_hash_pool.run(hash_password, plain_password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str):
+    return await password_hash_pool.run(
+        verify_password, plain_password, hashed_password
+    )
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+):
+    return await password_hash_pool.run(
+        verify_and_update_password, plain_password, hashed_password
+    )
+
+
 def create_access_token(data: dict):
     to_encode = data.copy()
     expiration_time = datetime.now(tz=ZoneInfo('UTC')) + timedelta(
         seconds=settings.TOKEN_TIME_EXPIRATION_SECS
     )
 
-    to_encode.update({'exp': expiration_time})
-    token = encode(
-        to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
-    )
+    to_encode.update({'exp': expiration_time, 'jti': uuid4().hex})
+    token = key_ring.encode(to_encode)
 
     return token, int(expiration_time.timestamp())
 
 
-async def get_current_user(
-    session: Session,
-    token: str = Depends(oauth2_schema),
-):
-    credential_exception = HTTPException(
+def detached_principal(user: User):
+    principal = User.__mapper__.class_manager.new_instance()
+
+    for column in PRINCIPAL_COLUMNS:
+        set_committed_value(principal, column, getattr(user, column))
+
+    make_transient_to_detached(principal)
+
+    return principal
+
+
+def credential_exception():
+    return HTTPException(
         status_code=HTTPStatus.UNAUTHORIZED,
         detail='Could not validate credentials',
         headers={'WWW-Authentication': 'Bearer'},
     )
 
-    try:
-        decoded_token = decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        email = decoded_token.get('sub')
 
-        if not email:
-            raise credential_exception
+def token_cache_key(token: str):
+    return hashlib.sha256(token.encode()).digest()
+
+
+def decode_access_token(token: str):
+    token_hash = token_cache_key(token)
+
+    decoded_token = token_cache.get(token_hash)
+    if decoded_token is not None:
+        return decoded_token
 
+    try:
+        decoded_token = key_ring.decode(token)
     except InvalidTokenError:
-        raise credential_exception
+        raise credential_exception()
+
+    if not decoded_token.get('sub'):
+        raise credential_exception()
+
+    token_cache.set(
+        token_hash, decoded_token, expires_at=decoded_token.get('exp')
+    )
+
+    return decoded_token
+
+
+async def ensure_not_revoked(session: AsyncSession, decoded_token: dict):
+    jti = decoded_token.get('jti')
+
+    if jti is not None and await is_revoked(session, jti):
+        raise credential_exception()
+
+
+async def get_current_user(
+    session: Session,
+    token: str = Depends(oauth2_schema),
+):
+    decoded_token = decode_access_token(token)
+    await ensure_not_revoked(session, decoded_token)
+    email = decoded_token['sub']
 
-    user = await session.scalar(select(User).where(User.email == email))
+    principal = principal_cache.get(email)
+    if principal is not None:
+        return await session.merge(principal, load=False)
+
+    user = await session.scalar(
+        select(User)
+        .options(
+            load_only(User.id, User.username, User.email),
+            raiseload(User.todos),
+        )
+        .where(User.email == email)
+        .execution_options(result_cache=True)
+    )
 
     if not user:
-        raise credential_exception
+        raise credential_exception()
+
+    principal_cache.set(
+        email, detached_principal(user), expires_at=decoded_token['exp']
+    )
 
     return user
 
 
+async def get_token_claims(
+    session: Session, token: str = Depends(oauth2_schema)
+):
+    decoded_token = decode_access_token(token)
+    await ensure_not_revoked(session, decoded_token)
+
+    if not isinstance(decoded_token.get('uid'), int):
+        raise credential_exception()
+
+    return decoded_token
+
+
+class LazyUser:
+    def __init__(self, session: AsyncSession, user_id: int):
+        self.id = user_id
+        self._session = session
+        self._user: User | None = None
+
+    async def load(self, *options):
+        if self._user is None:
+            self._user = await self._session.get(
+                User, self.id, options=options, populate_existing=True
+            )
+
+        if self._user is None:
+            raise credential_exception()
+
+        return self._user
+
+
 # TODO: mover para o contexto de users??
 def permission_validation(
     user_id: int,
-    user: Annotated[User, Depends(get_current_user)],
+    session: Session,
+    claims: Annotated[dict, Depends(get_token_claims)],
 ):
-    if user_id != user.id:
+    if user_id != claims['uid']:
         raise HTTPException(
             status_code=HTTPStatus.FORBIDDEN,
             detail='not enough permissions to get user info',
         )
 
-    return user
+    return LazyUser(session, user_id)
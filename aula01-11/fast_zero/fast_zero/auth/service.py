@@ -0,0 +1,112 @@
+import hashlib
+import secrets
+from datetime import timedelta
+from uuid import uuid4
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fast_zero.auth.models import RefreshToken
+from fast_zero.auth.security import credential_exception
+from fast_zero.commons.clock import utcnow
+from fast_zero.database.config import database
+from fast_zero.user.models import User
+from settings import settings
+
+
+def hash_refresh_token(token: str):
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def issue_refresh_token(
+    session: AsyncSession, user_id: int, family_id: str | None = None
+):
+    token = secrets.token_urlsafe(32)
+
+    session.add(
+        RefreshToken(
+            token_hash=hash_refresh_token(token),
+            family_id=family_id or uuid4().hex,
+            user_id=user_id,
+            expires_at=utcnow()
+            + timedelta(seconds=settings.REFRESH_TOKEN_TIME_EXPIRATION_SECS),
+        )
+    )
+
+    return token
+
+
+async def rotate_refresh_token(session: AsyncSession, token: str):
+    now = utcnow()
+    token_hash = hash_refresh_token(token)
+
+    user_email = (
+        select(User.email)
+        .where(User.id == RefreshToken.user_id)
+        .scalar_subquery()
+    )
+    rotated = await session.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.token_hash == token_hash,
+            RefreshToken.rotated_at.is_(None),
+            RefreshToken.expires_at > now,
+        )
+        .values(rotated_at=now)
+        .returning(RefreshToken.family_id, RefreshToken.user_id, user_email)
+        .execution_options(synchronize_session=False)
+    )
+    row = rotated.first()
+
+    if row is None or row[2] is None:
+        # token já usado: alguém está reaproveitando, derruba a família toda
+        reused_family = await session.scalar(
+            select(RefreshToken.family_id).where(
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.rotated_at.is_not(None),
+            )
+        )
+
+        if reused_family:
+            await revoke_refresh_token_family(session, reused_family)
+            await session.commit()
+
+        raise credential_exception()
+
+    family_id, user_id, email = row
+    new_token = issue_refresh_token(session, user_id, family_id)
+    await session.commit()
+
+    return new_token, user_id, email, family_id
+
+
+async def revoke_refresh_token_family(session: AsyncSession, family_id: str):
+    await session.execute(
+        delete(RefreshToken).where(RefreshToken.family_id == family_id)
+    )
+
+
+async def purge_expired_refresh_tokens(session: AsyncSession, batch_size: int):
+    purged = 0
+
+    while True:
+        expired = (
+            select(RefreshToken.id)
+            .where(RefreshToken.expires_at <= utcnow())
+            .limit(batch_size)
+        )
+        result = await session.execute(
+            delete(RefreshToken).where(RefreshToken.id.in_(expired))
+        )
+        await session.commit()
+
+        purged += result.rowcount
+        if result.rowcount < batch_size:
+            return purged
+
+
+async def sweep_refresh_tokens():
+    async with AsyncSession(database.engine) as session:
+        await purge_expired_refresh_tokens(
+            session, settings.REFRESH_TOKEN_SWEEP_BATCH_SIZE
+        )
@@ -0,0 +1,6 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+
+def utcnow():
+    return datetime.now(tz=ZoneInfo('UTC')).replace(tzinfo=None)
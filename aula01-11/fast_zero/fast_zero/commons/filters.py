@@ -4,3 +4,4 @@ from pydantic import BaseModel
 class FilterPage(BaseModel):
     offset: int = 0
     limit: int = 20
+    cursor: str | None = None
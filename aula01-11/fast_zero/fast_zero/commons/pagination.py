@@ -0,0 +1,56 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from http import HTTPStatus
+
+from fastapi.exceptions import HTTPException
+from sqlalchemy import Select, literal, tuple_
+
+from fast_zero.commons.filters import FilterPage
+
+
+def encode_cursor(created_at: datetime, id: int):
+    raw = json.dumps([created_at.isoformat(), id]).encode()
+
+    return urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str):
+    try:
+        raw = urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, id = json.loads(raw)
+
+        return datetime.fromisoformat(created_at), int(id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST, detail='invalid cursor'
+        )
+
+
+def paginate(query: Select, model, page: FilterPage):
+    # keyset em (created_at, id): a página N custa o mesmo que a primeira
+    order = (model.created_at, model.id)
+    query = query.order_by(*order).limit(page.limit + 1)
+
+    if page.cursor:
+        # literal com o tipo da coluna: no sqlite é ele que decide o formato
+        # de texto da data comparada
+        cursor = (
+            literal(value, column.type)
+            for column, value in zip(order, decode_cursor(page.cursor))
+        )
+        query = query.where(tuple_(*order) > tuple_(*cursor))
+    else:
+        query = query.offset(page.offset)
+
+    return query
+
+
+def split_page(rows: list, limit: int):
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+
+    return rows, encode_cursor(last.created_at, last.id)
@@ -0,0 +1,17 @@
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def run_periodically(interval: float, job, *, immediately=False):
+    if not immediately:
+        await asyncio.sleep(interval)
+
+    while True:
+        try:
+            await job()
+        except Exception:
+            logger.exception('periodic job %s failed', job.__name__)
+
+        await asyncio.sleep(interval)
@@ -0,0 +1,185 @@
+from collections import defaultdict
+
+from sqlalchemy import Table, event, inspect
+from sqlalchemy.orm import (
+    InstanceState,
+    ORMExecuteState,
+    Session,
+    loading,
+    make_transient_to_detached,
+    object_session,
+)
+from sqlalchemy.orm.attributes import set_committed_value
+
+from fast_zero.commons.cache import TTLCache
+from settings import settings
+
+CACHE_OPTION = 'result_cache'
+PENDING_WRITES = 'result_cache_writes'
+
+MAPPER_EVENTS = ('after_insert', 'after_update', 'after_delete')
+SESSION_EVENTS = ('after_commit', 'after_rollback')
+
+
+def hashable(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(hashable(item) for item in value)
+
+    return value
+
+
+def detached_copy(value):
+    state = inspect(value, raiseerr=False)
+
+    if not isinstance(state, InstanceState):
+        return value
+
+    # cópia solta da sessão: o objeto original continua vivo e pode ser
+    # alterado por quem fez a query
+    copy = state.mapper.class_manager.new_instance()
+    for attr in state.mapper.column_attrs:
+        if attr.key in state.dict:
+            set_committed_value(copy, attr.key, state.dict[attr.key])
+    make_transient_to_detached(copy)
+
+    return copy
+
+
+def cascading_tables(tables):
+    found = set(tables)
+    pending = list(tables)
+
+    while pending:
+        table = pending.pop()
+        for other in table.metadata.tables.values():
+            if other not in found and any(
+                fk.column.table is table and fk.ondelete == 'CASCADE'
+                for fk in other.foreign_keys
+            ):
+                found.add(other)
+                pending.append(other)
+
+    return found
+
+
+class ResultCache:
+    def __init__(self, max_size: int, ttl: int):
+        self.entries = TTLCache(max_size=max_size, ttl=ttl)
+        self._generations: defaultdict[Table, int] = defaultdict(int)
+        self._tables: set[Table] = set()
+        self._models = ()
+
+    def install(self, *models):
+        self.uninstall()
+        self._models = models
+        self._tables = {
+            table for model in models for table in inspect(model).tables
+        }
+
+        event.listen(Session, 'do_orm_execute', self._on_execute)
+        for name in SESSION_EVENTS:
+            event.listen(Session, name, self._on_transaction_end)
+        for model in models:
+            for name in MAPPER_EVENTS:
+                event.listen(model, name, self._on_flush)
+
+    def uninstall(self):
+        if not self._models:
+            return
+
+        event.remove(Session, 'do_orm_execute', self._on_execute)
+        for name in SESSION_EVENTS:
+            event.remove(Session, name, self._on_transaction_end)
+        for model in self._models:
+            for name in MAPPER_EVENTS:
+                event.remove(model, name, self._on_flush)
+
+        self._models = ()
+        self._tables = set()
+        self.clear()
+
+    def clear(self):
+        self.entries.clear()
+        self._generations.clear()
+
+    def invalidate(self, tables):
+        for table in tables:
+            self._generations[table] += 1
+
+    def _touch(self, session: Session, tables):
+        tables = cascading_tables(tables)
+        self.invalidate(tables)
+        session.info.setdefault(PENDING_WRITES, set()).update(tables)
+
+    def _on_flush(self, mapper, connection, target):
+        self._touch(object_session(target), mapper.tables)
+
+    def _on_transaction_end(self, session: Session):
+        # o que foi lido entre o flush e o commit de outra sessão ainda pode
+        # ter visto o estado antigo
+        self.invalidate(session.info.pop(PENDING_WRITES, ()))
+
+    def _key(self, state: ORMExecuteState, tables):
+        cache_key = state.statement._generate_cache_key()
+
+        if cache_key is None:
+            return None
+
+        return (
+            cache_key.key,
+            tuple(
+                hashable(param.effective_value)
+                for param in cache_key.bindparams
+            ),
+            tuple(
+                (name, hashable(value))
+                for name, value in sorted((state.parameters or {}).items())
+            ),
+            tuple(self._generations[table] for table in tables),
+        )
+
+    def _on_execute(self, state: ORMExecuteState):
+        tables = {
+            table for mapper in state.all_mappers for table in mapper.tables
+        }
+
+        if state.is_insert or state.is_update or state.is_delete:
+            self._touch(state.session, tables)
+            return None
+
+        if (
+            not state.is_select
+            or not state.execution_options.get(CACHE_OPTION)
+            or not tables
+            or not tables <= self._tables
+            # a sessão enxerga as próprias escritas ainda não commitadas
+            or state.session.info.get(PENDING_WRITES)
+        ):
+            return None
+
+        key = self._key(state, sorted(tables, key=lambda table: table.name))
+        if key is None:
+            return None
+
+        cached = self.entries.get(key)
+        if cached is not None:
+            return loading.merge_frozen_result(
+                state.session, state.statement, cached, load=False
+            )()
+
+        frozen = state.invoke_statement().freeze()
+        self.entries.set(
+            key,
+            frozen.with_new_rows([
+                tuple(detached_copy(value) for value in row)
+                for row in frozen.rewrite_rows()
+            ]),
+        )
+
+        return frozen()
+
+
+result_cache = ResultCache(
+    max_size=settings.RESULT_CACHE_MAX_SIZE,
+    ttl=settings.RESULT_CACHE_TTL_SECS,
+)
@@ -1,10 +1,223 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+import asyncio
+import hashlib
+import logging
+from contextlib import asynccontextmanager
+from functools import partial
+from time import time
 
-from settings import settings
+from fastapi import Request
+from sqlalchemy import event, make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+)
 
-engine = create_async_engine(settings.DATABASE_URL)
+from fast_zero.commons.cache import TTLCache
+from settings import Settings
 
+logger = logging.getLogger(__name__)
 
-async def get_session():
-    async with AsyncSession(engine, expire_on_commit=False) as session:
+READ_ONLY_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+
+def enable_sqlite_foreign_keys(engine: AsyncEngine):
+    # sqlite só aplica ON DELETE CASCADE com a pragma ligada por conexão
+    @event.listens_for(engine.sync_engine, 'connect')
+    def set_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA foreign_keys=ON')
+        cursor.close()
+
+
+def create_engine(settings: Settings, url: str):
+    options = {
+        'pool_pre_ping': settings.DB_POOL_PRE_PING,
+        'pool_recycle': settings.DB_POOL_RECYCLE_SECS,
+    }
+
+    # sqlite usa pools sem limite de conexões (StaticPool/NullPool)
+    if make_url(url).get_backend_name() == 'sqlite':
+        engine = create_async_engine(url, **options)
+        enable_sqlite_foreign_keys(engine)
+
+        return engine
+
+    return create_async_engine(
+        url,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECS,
+        **options,
+    )
+
+
+def writer_key(request: Request):
+    authorization = request.headers.get('authorization')
+    if not authorization:
+        return None
+
+    return hashlib.sha256(authorization.encode()).digest()
+
+
+class Replica:
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.in_use = 0
+        self.unhealthy_until = 0.0
+
+
+class Database:
+    def __init__(self):
+        self._engine: AsyncEngine | None = None
+        self.replicas: list[Replica] = []
+        self.selection = 'round_robin'
+        self.cooldown = 0.0
+        self.recent_writers = TTLCache(max_size=1, ttl=0)
+        self._next_replica = 0
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            raise RuntimeError('database engine not started')
+
+        return self._engine
+
+    def start(self, settings: Settings):
+        self._engine = create_engine(settings, settings.DATABASE_URL)
+        self.replicas = [
+            Replica(create_engine(settings, url))
+            for url in settings.DATABASE_REPLICA_URLS
+        ]
+        self.selection = settings.DB_REPLICA_SELECTION
+        self.cooldown = settings.DB_REPLICA_COOLDOWN_SECS
+        self.recent_writers = TTLCache(
+            max_size=settings.DB_READ_YOUR_WRITES_MAX_KEYS,
+            ttl=settings.DB_READ_YOUR_WRITES_SECS,
+        )
+
+        return self._engine
+
+    async def warm_up(self, min_connections: int):
+        engines = [self.engine, *(replica.engine for replica in self.replicas)]
+
+        async def connect(engine: AsyncEngine):
+            async with engine.connect() as conn:
+                await conn.exec_driver_sql('SELECT 1')
+
+        # conexões abertas em paralelo ficam ociosas no pool ao voltar
+        try:
+            await asyncio.gather(
+                *(
+                    connect(engine)
+                    for engine in engines
+                    for _ in range(min_connections)
+                )
+            )
+        except Exception:
+            logger.exception('could not warm up the connection pool')
+
+    async def stop(self):
+        for replica in self.replicas:
+            await replica.engine.dispose()
+        self.replicas = []
+
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = None
+
+    def choose_replica(self):
+        now = time()
+        healthy = [r for r in self.replicas if r.unhealthy_until <= now]
+
+        if not healthy:
+            return None
+
+        if self.selection == 'least_connections':
+            return min(healthy, key=lambda replica: replica.in_use)
+
+        self._next_replica += 1
+        return healthy[self._next_replica % len(healthy)]
+
+    def mark_writer(self, request: Request):
+        key = writer_key(request)
+        if key is not None:
+            self.recent_writers.set(key, True)
+
+    def recently_wrote(self, request: Request):
+        key = writer_key(request)
+        return key is not None and self.recent_writers.get(key) is not None
+
+    async def _connect_replica(self):
+        while (replica := self.choose_replica()) is not None:
+            session = AsyncSession(replica.engine, expire_on_commit=False)
+            try:
+                await session.connection()
+            except (DBAPIError, OSError):
+                await session.close()
+                replica.unhealthy_until = time() + self.cooldown
+                logger.warning(
+                    'replica %s unhealthy, skipping it for %ss',
+                    replica.engine.url.render_as_string(),
+                    self.cooldown,
+                )
+                continue
+
+            return replica, session
+
+        return None, AsyncSession(self.engine, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def primary_session(self):
+        async with AsyncSession(
+            self.engine, expire_on_commit=False
+        ) as session:
+            yield session
+
+    @asynccontextmanager
+    async def session(self, request: Request):
+        if request.method not in READ_ONLY_METHODS:
+            try:
+                async with self.primary_session() as session:
+                    yield session
+            finally:
+                self.mark_writer(request)
+            return
+
+        if self.recently_wrote(request):
+            replica, session = (
+                None,
+                AsyncSession(self.engine, expire_on_commit=False),
+            )
+        else:
+            replica, session = await self._connect_replica()
+
+        if replica is not None:
+            replica.in_use += 1
+        try:
+            async with session:
+                yield session
+        finally:
+            if replica is not None:
+                replica.in_use -= 1
+
+
+database = Database()
+
+
+async def get_session(request: Request):
+    async with database.session(request) as session:
         yield session
+
+
+async def get_primary_session():
+    # leituras que não toleram o atraso das réplicas
+    async with database.primary_session() as session:
+        yield session
+
+
+def get_session_factory(request: Request):
+    # para StreamingResponse: a sessão de get_session é fechada antes do corpo
+    # começar a ser enviado
+    return partial(database.session, request)
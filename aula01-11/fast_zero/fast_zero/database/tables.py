@@ -1,3 +1,16 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import registry
 
-table_registry = registry()
+# no sqlite datas são texto e o CURRENT_TIMESTAMP dos server defaults grava
+# 'YYYY-MM-DD HH:MM:SS'. datas vindas do python (parâmetros do keyset e do
+# sync) precisam do mesmo formato para a comparação de texto bater
+table_registry = registry(
+    type_annotation_map={
+        datetime: DateTime().with_variant(
+            sqlite.DATETIME(truncate_microseconds=True), 'sqlite'
+        )
+    }
+)
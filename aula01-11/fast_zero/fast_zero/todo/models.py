@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, func
+from sqlalchemy import DDL, ForeignKey, Index, event, func, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from fast_zero.database.tables import table_registry
@@ -10,12 +10,42 @@ from fast_zero.todo.enums import TodoState
 @table_registry.mapped_as_dataclass
 class Todo:
     __tablename__ = 'todos'
+    __mapper_args__ = {'eager_defaults': True}
+    __table_args__ = (
+        Index('ix_todos_user_id_id', 'user_id', 'id'),
+        Index('ix_todos_user_id_state', 'user_id', 'state'),
+        Index('ix_todos_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+        Index('ix_todos_user_id_updated_at', 'user_id', 'updated_at'),
+        Index(
+            'ix_todos_title_trgm',
+            'title',
+            postgresql_using='gin',
+            postgresql_ops={'title': 'gin_trgm_ops'},
+        ).ddl_if(dialect='postgresql'),
+        Index(
+            'ix_todos_description_trgm',
+            'description',
+            postgresql_using='gin',
+            postgresql_ops={'description': 'gin_trgm_ops'},
+        ).ddl_if(dialect='postgresql'),
+        Index(
+            'ix_todos_trash_updated_at',
+            'updated_at',
+            postgresql_where=text("state = 'trash'"),
+            sqlite_where=text("state = 'trash'"),
+        ),
+        # sem autoincrement o sqlite reaproveita o id do maior todo apagado,
+        # que ainda tem tombstone
+        {'sqlite_autoincrement': True},
+    )
 
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
     title: Mapped[str]
     description: Mapped[str]
     state: Mapped[TodoState]
-    user_id: Mapped[int] = mapped_column(ForeignKey('users.id'))
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey('users.id', ondelete='CASCADE')
+    )
 
     created_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now()
@@ -23,3 +53,85 @@ class Todo:
     updated_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now(), onupdate=func.now()
     )
+
+
+@table_registry.mapped_as_dataclass
+class TodoArchive:
+    __tablename__ = 'todos_archive'
+    __table_args__ = (
+        Index(
+            'ix_todos_archive_user_id_created_at_id',
+            'user_id',
+            'created_at',
+            'id',
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    title: Mapped[str]
+    description: Mapped[str]
+    state: Mapped[TodoState]
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey('users.id', ondelete='CASCADE')
+    )
+    created_at: Mapped[datetime]
+    updated_at: Mapped[datetime]
+
+    archived_at: Mapped[datetime] = mapped_column(
+        init=False, server_default=func.now()
+    )
+
+
+@table_registry.mapped_as_dataclass
+class TodoTombstone:
+    __tablename__ = 'todo_tombstones'
+    __table_args__ = (
+        Index(
+            'ix_todo_tombstones_user_id_deleted_at', 'user_id', 'deleted_at'
+        ),
+    )
+
+    todo_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey('users.id', ondelete='CASCADE')
+    )
+    deleted_at: Mapped[datetime] = mapped_column(
+        init=False, server_default=func.now()
+    )
+
+
+# no sqlite a busca por substring usa uma tabela fts5 com tokenizer trigram,
+# mantida em sincronia com todos por triggers
+TODOS_FTS_DDL = (
+    'CREATE VIRTUAL TABLE todos_fts USING fts5(title, description, '
+    "content='todos', content_rowid='id', tokenize='trigram')",
+    'CREATE TRIGGER todos_fts_insert AFTER INSERT ON todos BEGIN '
+    'INSERT INTO todos_fts(rowid, title, description) '
+    'VALUES (new.id, new.title, new.description); END',
+    'CREATE TRIGGER todos_fts_delete AFTER DELETE ON todos BEGIN '
+    'INSERT INTO todos_fts(todos_fts, rowid, title, description) '
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    'CREATE TRIGGER todos_fts_update AFTER UPDATE OF title, description '
+    'ON todos BEGIN '
+    'INSERT INTO todos_fts(todos_fts, rowid, title, description) '
+    "VALUES ('delete', old.id, old.title, old.description); "
+    'INSERT INTO todos_fts(rowid, title, description) '
+    'VALUES (new.id, new.title, new.description); END',
+)
+
+event.listen(
+    Todo.__table__,
+    'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(
+        dialect='postgresql'
+    ),
+)
+for ddl in TODOS_FTS_DDL:
+    event.listen(
+        Todo.__table__, 'after_create', DDL(ddl).execute_if(dialect='sqlite')
+    )
+event.listen(
+    Todo.__table__,
+    'after_drop',
+    DDL('DROP TABLE IF EXISTS todos_fts').execute_if(dialect='sqlite'),
+)
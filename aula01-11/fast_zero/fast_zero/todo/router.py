@@ -1,28 +1,69 @@
+from collections.abc import Callable
 from http import HTTPStatus
-from typing import Annotated
+from typing import Annotated, Literal
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Body, Depends, Query, Request
 from fastapi.exceptions import HTTPException
-from sqlalchemy import select
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from fast_zero.auth.security import get_current_user
-from fast_zero.database.config import get_session
-from fast_zero.todo.models import Todo
+from fast_zero.commons.filters import FilterPage
+from fast_zero.commons.pagination import paginate, split_page
+from fast_zero.database.config import (
+    get_primary_session,
+    get_session,
+    get_session_factory,
+)
+from fast_zero.todo.models import Todo, TodoArchive, TodoTombstone
 from fast_zero.todo.schemas import (
+    ArchivedTodoList,
     FilterTodo,
+    TodoBulkResult,
+    TodoBulkUpdate,
+    TodoChanges,
+    TodoImportResult,
     TodoList,
     TodoRequest,
     TodoResponse,
+    TodoSelection,
     TodoUpdate,
 )
+from fast_zero.todo.service import (
+    csv_lines,
+    csv_records,
+    decode_sync_token,
+    encode_sync_token,
+    execute_bulk,
+    import_todo_records,
+    ndjson_lines,
+    ndjson_records,
+    restore_todo,
+    selection_filters,
+    stream_todos,
+    text_lines,
+    todo_changes,
+    todo_filters,
+)
 from fast_zero.user.models import User
+from settings import settings
 
 router = APIRouter(prefix='/todos', tags=['todos'])
 
 Session = Annotated[AsyncSession, Depends(get_session)]
+PrimarySession = Annotated[AsyncSession, Depends(get_primary_session)]
+SessionFactory = Annotated[Callable, Depends(get_session_factory)]
 CurrentUser = Annotated[User, Depends(get_current_user)]
 Filter = Annotated[FilterTodo, Query()]
+Page = Annotated[FilterPage, Query()]
+TodoBatch = Annotated[
+    list[TodoRequest],
+    Body(min_length=1, max_length=settings.TODO_BULK_MAX_SIZE),
+]
+FileFormat = Annotated[Literal['ndjson', 'csv'], Query(alias='format')]
+
+EXPORT_MEDIA_TYPES = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
 
 
 @router.post('/', status_code=HTTPStatus.CREATED, response_model=TodoResponse)
@@ -40,30 +81,126 @@ async def create_todo(
 
     session.add(db_todo)
     await session.commit()
-    await session.refresh(db_todo)
 
     return db_todo
 
 
+@router.post('/bulk', status_code=HTTPStatus.CREATED, response_model=TodoList)
+async def create_todos(todos: TodoBatch, user: CurrentUser, session: Session):
+    # sem sort_by_parameter_order: no sqlite ele volta a um INSERT por linha.
+    # os ids saem na ordem do VALUES, então ordenar por id basta
+    db_todos = await session.scalars(
+        insert(Todo).returning(Todo),
+        [{**todo.model_dump(), 'user_id': user.id} for todo in todos],
+    )
+    created = sorted(db_todos.all(), key=lambda todo: todo.id)
+    await session.commit()
+
+    return TodoList(todos=created)
+
+
+@router.patch(
+    '/bulk', status_code=HTTPStatus.OK, response_model=TodoBulkResult
+)
+async def update_todos(
+    bulk: TodoBulkUpdate, user: CurrentUser, session: Session
+):
+    count, ids = await execute_bulk(
+        session,
+        update(Todo)
+        .where(*selection_filters(bulk, user.id, session.bind.dialect.name))
+        .values(state=bulk.state),
+        bulk.return_ids,
+    )
+
+    return TodoBulkResult(count=count, ids=ids)
+
+
+@router.delete(
+    '/bulk', status_code=HTTPStatus.OK, response_model=TodoBulkResult
+)
+async def delete_todos(
+    selection: TodoSelection, user: CurrentUser, session: Session
+):
+    count, ids = await execute_bulk(
+        session,
+        delete(Todo).where(
+            *selection_filters(selection, user.id, session.bind.dialect.name)
+        ),
+        selection.return_ids,
+    )
+
+    return TodoBulkResult(count=count, ids=ids)
+
+
 @router.get('/', status_code=HTTPStatus.OK, response_model=TodoList)
 async def list_todos(filter: Filter, user: CurrentUser, session: Session):
-    query = (
-        select(Todo)
-        .where(Todo.user_id == user.id)
-        .offset(filter.offset)
-        .limit(filter.limit)
-    )
+    query = paginate(select(Todo).where(Todo.user_id == user.id), Todo, filter)
 
-    if filter.title:
-        query = query.filter(Todo.title.contains(filter.title))
-    if filter.description:
-        query = query.filter(Todo.description.contains(filter.description))
-    if filter.state:
-        query = query.filter(Todo.state == filter.state)
+    query = query.filter(*todo_filters(filter, session.bind.dialect.name))
+    if filter.cursor is None and not filter.offset:
+        query = query.execution_options(result_cache=True)
 
     todos = await session.scalars(query)
+    page, next_cursor = split_page(todos.all(), filter.limit)
 
-    return TodoList(todos=todos.all())
+    return TodoList(todos=page, next_cursor=next_cursor)
+
+
+@router.get('/export', status_code=HTTPStatus.OK)
+async def export_todos(
+    user: CurrentUser,
+    session_factory: SessionFactory,
+    export_format: FileFormat = 'ndjson',
+):
+    batches = stream_todos(session_factory, user.id)
+    lines = (
+        csv_lines(batches) if export_format == 'csv' else ndjson_lines(batches)
+    )
+
+    return StreamingResponse(
+        lines,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            'Content-Disposition': (
+                f'attachment; filename="todos.{export_format}"'
+            )
+        },
+    )
+
+
+@router.get('/changes', status_code=HTTPStatus.OK, response_model=TodoChanges)
+async def list_todo_changes(
+    user: CurrentUser, session: PrimarySession, since: str | None = None
+):
+    todos, deleted, synced_at = await todo_changes(
+        session, user.id, decode_sync_token(since) if since else None
+    )
+
+    return TodoChanges(
+        todos=todos, deleted=deleted, next_token=encode_sync_token(synced_at)
+    )
+
+
+@router.post(
+    '/import', status_code=HTTPStatus.OK, response_model=TodoImportResult
+)
+async def import_todos(
+    request: Request,
+    user: CurrentUser,
+    session: Session,
+    import_format: FileFormat = 'ndjson',
+):
+    lines = text_lines(request.stream())
+    records = (
+        csv_records(lines) if import_format == 'csv' else ndjson_records(lines)
+    )
+
+    imported, failed, errors = await import_todo_records(
+        session, user.id, records
+    )
+
+    return TodoImportResult(imported=imported, failed=failed, errors=errors)
 
 
 @router.patch(
@@ -85,7 +222,6 @@ async def update_todo(
         setattr(db_todo, key, value)
 
     await session.commit()
-    await session.refresh(db_todo)
 
     return db_todo
 
@@ -101,5 +237,40 @@ async def delete_todo(todo_id: int, user: CurrentUser, session: Session):
             status_code=HTTPStatus.NOT_FOUND, detail='todo not found'
         )
 
+    session.add(TodoTombstone(todo_id=db_todo.id, user_id=user.id))
     await session.delete(db_todo)
     await session.commit()
+
+
+@router.get(
+    '/archive', status_code=HTTPStatus.OK, response_model=ArchivedTodoList
+)
+async def list_archived_todos(page: Page, user: CurrentUser, session: Session):
+    query = paginate(
+        select(TodoArchive).where(TodoArchive.user_id == user.id),
+        TodoArchive,
+        page,
+    )
+
+    todos = await session.scalars(query)
+    archived, next_cursor = split_page(todos.all(), page.limit)
+
+    return ArchivedTodoList(todos=archived, next_cursor=next_cursor)
+
+
+@router.post(
+    '/archive/{todo_id}/restore',
+    status_code=HTTPStatus.OK,
+    response_model=TodoResponse,
+)
+async def restore_archived_todo(
+    todo_id: int, user: CurrentUser, session: Session
+):
+    todo = await restore_todo(session, todo_id, user.id)
+
+    if not todo:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail='todo not found'
+        )
+
+    return todo
@@ -4,12 +4,24 @@ from pydantic import BaseModel, ConfigDict, Field
 
 from fast_zero.commons.filters import FilterPage
 from fast_zero.todo.enums import TodoState
+from settings import settings
 
 
-class FilterTodo(FilterPage):
+class TodoCriteria(BaseModel):
     title: str | None = None
     description: str | None = None
     state: TodoState | None = None
+    case_insensitive: bool = False
+
+
+class FilterTodo(TodoCriteria, FilterPage):
+    pass
+
+
+class TodoSelectionFilter(TodoCriteria):
+    # operações em lote afetam tudo que casar: offset/limit/cursor não
+    # paginam nada aqui e são recusados em vez de ignorados
+    model_config = ConfigDict(extra='forbid')
 
 
 class TodoRequest(BaseModel):
@@ -38,3 +50,47 @@ class TodoResponse(TodoRequest):
 
 class TodoList(BaseModel):
     todos: list[TodoResponse]
+    next_cursor: str | None = None
+
+
+class ArchivedTodoResponse(TodoResponse):
+    archived_at: datetime = Field(alias='archivedAt')
+
+
+class ArchivedTodoList(BaseModel):
+    todos: list[ArchivedTodoResponse]
+    next_cursor: str | None = None
+
+
+class TodoSelection(BaseModel):
+    ids: list[int] | None = Field(
+        default=None, max_length=settings.TODO_BULK_MAX_SIZE
+    )
+    filter: TodoSelectionFilter | None = None
+    return_ids: bool = False
+
+
+class TodoBulkUpdate(TodoSelection):
+    state: TodoState
+
+
+class TodoBulkResult(BaseModel):
+    count: int
+    ids: list[int] | None = None
+
+
+class TodoImportError(BaseModel):
+    row: int
+    errors: list[str]
+
+
+class TodoImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: list[TodoImportError]
+
+
+class TodoChanges(BaseModel):
+    todos: list[TodoResponse]
+    deleted: list[int]
+    next_token: str
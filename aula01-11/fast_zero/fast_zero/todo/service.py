@@ -0,0 +1,547 @@
+import codecs
+import csv
+import io
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime, timedelta
+from http import HTTPStatus
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import (
+    Delete,
+    Update,
+    column,
+    delete,
+    func,
+    insert,
+    literal_column,
+    select,
+    table,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from fast_zero.commons.clock import utcnow
+from fast_zero.database.cache import result_cache
+from fast_zero.database.config import database
+from fast_zero.todo.enums import TodoState
+from fast_zero.todo.models import Todo, TodoArchive, TodoTombstone
+from fast_zero.todo.schemas import (
+    TodoCriteria,
+    TodoImportError,
+    TodoRequest,
+    TodoResponse,
+    TodoSelection,
+)
+from settings import settings
+
+ARCHIVE_COLUMNS = (
+    'id',
+    'title',
+    'description',
+    'state',
+    'user_id',
+    'created_at',
+    'updated_at',
+)
+
+IMPORT_COLUMNS = ('title', 'description', 'state', 'user_id')
+COPY_TODOS = f'COPY todos ({", ".join(IMPORT_COLUMNS)}) FROM STDIN'
+CSV_INCOMPLETE_RECORD = 'unexpected end of data'
+
+# trigramas só indexam termos com pelo menos 3 caracteres
+MIN_TRIGRAM_LENGTH = 3
+
+todos_fts = table('todos_fts', column('rowid'))
+
+
+def like_pattern(term: str):
+    escaped = (
+        term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    )
+
+    return f'%{escaped}%'
+
+
+def fts_phrase(column: InstrumentedAttribute, term: str):
+    phrase = term.replace('"', '""')
+
+    return f'{column.key} : "{phrase}"'
+
+
+def contains_text(
+    column: InstrumentedAttribute,
+    term: str,
+    dialect: str,
+    case_insensitive: bool = False,
+):
+    if dialect != 'sqlite':
+        # postgres: LIKE/ILIKE usam os índices gin_trgm_ops, e a barra já é o
+        # escape padrão dele
+        if case_insensitive:
+            return column.ilike(like_pattern(term))
+        return column.like(like_pattern(term))
+
+    case_sensitive_match = func.instr(column, term) > 0
+
+    if len(term) < MIN_TRIGRAM_LENGTH:
+        if case_insensitive:
+            return column.ilike(like_pattern(term), escape='\\')
+        return case_sensitive_match
+
+    # o tokenizer trigram ignora caixa, o instr refina quando ela importa
+    fts_match = Todo.id.in_(
+        select(todos_fts.c.rowid).where(
+            literal_column('todos_fts').op('MATCH')(fts_phrase(column, term))
+        )
+    )
+    if case_insensitive:
+        return fts_match
+
+    return fts_match & case_sensitive_match
+
+
+def todo_filters(filter: TodoCriteria, dialect: str):
+    filters = []
+
+    if filter.title:
+        filters.append(
+            contains_text(
+                Todo.title, filter.title, dialect, filter.case_insensitive
+            )
+        )
+    if filter.description:
+        filters.append(
+            contains_text(
+                Todo.description,
+                filter.description,
+                dialect,
+                filter.case_insensitive,
+            )
+        )
+    if filter.state:
+        filters.append(Todo.state == filter.state)
+
+    return filters
+
+
+def selection_filters(selection: TodoSelection, user_id: int, dialect: str):
+    if selection.ids is None and selection.filter is None:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail='ids or filter required',
+        )
+
+    filters = [Todo.user_id == user_id]
+
+    if selection.ids is not None:
+        filters.append(Todo.id.in_(selection.ids))
+    if selection.filter is not None:
+        criteria = todo_filters(selection.filter, dialect)
+        # filtro vazio casaria com todos os todos do usuário
+        if not criteria:
+            raise HTTPException(
+                status_code=HTTPStatus.BAD_REQUEST,
+                detail='filter requires at least one criterion',
+            )
+        filters.extend(criteria)
+
+    return filters
+
+
+async def execute_bulk(
+    session: AsyncSession, statement: Update | Delete, return_ids: bool
+):
+    statement = statement.execution_options(synchronize_session=False)
+
+    if isinstance(statement, Delete):
+        # delete sempre devolve os ids: eles viram tombstones para o sync
+        rows = (
+            await session.execute(statement.returning(Todo.id, Todo.user_id))
+        ).all()
+        await bury_todos(session, rows)
+        ids = [row.id for row in rows]
+        count = len(ids)
+    elif return_ids:
+        ids = (await session.scalars(statement.returning(Todo.id))).all()
+        count = len(ids)
+    else:
+        ids = None
+        count = (await session.execute(statement)).rowcount
+    await session.commit()
+
+    return count, ids if return_ids else None
+
+
+async def bury_todos(session: AsyncSession, rows):
+    if rows:
+        await session.execute(
+            insert(TodoTombstone),
+            [{'todo_id': id, 'user_id': user_id} for id, user_id in rows],
+        )
+
+
+async def archive_trash_todos(
+    session: AsyncSession, older_than: timedelta, batch_size: int
+):
+    archived = 0
+    cutoff = utcnow() - older_than
+
+    while True:
+        ids = (
+            await session.scalars(
+                select(Todo.id)
+                .where(Todo.state == TodoState.trash, Todo.updated_at < cutoff)
+                .order_by(Todo.updated_at)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+        ).all()
+
+        if ids:
+            await session.execute(
+                insert(TodoArchive).from_select(
+                    ARCHIVE_COLUMNS,
+                    select(
+                        *(getattr(Todo, name) for name in ARCHIVE_COLUMNS)
+                    ).where(Todo.id.in_(ids)),
+                )
+            )
+            await session.execute(
+                insert(TodoTombstone).from_select(
+                    ('todo_id', 'user_id'),
+                    select(Todo.id, Todo.user_id).where(Todo.id.in_(ids)),
+                )
+            )
+            await session.execute(delete(Todo).where(Todo.id.in_(ids)))
+        await session.commit()
+
+        archived += len(ids)
+        if len(ids) < batch_size:
+            return archived
+
+
+async def restore_todo(session: AsyncSession, todo_id: int, user_id: int):
+    archived = await session.scalar(
+        select(TodoArchive).where(
+            TodoArchive.id == todo_id, TodoArchive.user_id == user_id
+        )
+    )
+
+    if archived is None:
+        return None
+
+    todo = await session.scalar(
+        insert(Todo)
+        .values(
+            id=archived.id,
+            title=archived.title,
+            description=archived.description,
+            state=TodoState.todo,
+            user_id=archived.user_id,
+            created_at=archived.created_at,
+        )
+        .returning(Todo)
+    )
+    await session.execute(
+        delete(TodoTombstone).where(TodoTombstone.todo_id == todo_id)
+    )
+    await session.delete(archived)
+    await session.commit()
+
+    return todo
+
+
+async def archive_todos():
+    async with AsyncSession(database.engine) as session:
+        await archive_trash_todos(
+            session,
+            timedelta(seconds=settings.TODO_ARCHIVE_AFTER_SECS),
+            settings.TODO_ARCHIVE_BATCH_SIZE,
+        )
+
+
+async def stream_todos(session_factory, user_id: int):
+    query = (
+        select(*(getattr(Todo, name) for name in TodoResponse.model_fields))
+        .where(Todo.user_id == user_id)
+        .order_by(Todo.id)
+        .execution_options(yield_per=settings.TODO_EXPORT_BATCH_SIZE)
+    )
+
+    async with session_factory() as session:
+        result = await session.stream(query)
+        async for rows in result.partitions():
+            yield [
+                TodoResponse.model_validate(row).model_dump(
+                    mode='json', by_alias=True
+                )
+                for row in rows
+            ]
+
+
+async def ndjson_lines(batches):
+    async for batch in batches:
+        yield ''.join(f'{json.dumps(todo)}\n' for todo in batch)
+
+
+async def csv_lines(batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(
+        field.alias or name
+        for name, field in TodoResponse.model_fields.items()
+    )
+
+    async for batch in batches:
+        writer.writerows(todo.values() for todo in batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def ensure_record_size(text: str):
+    # sem limite, um corpo sem quebra de linha (ou uma aspa aberta no csv)
+    # acumularia o upload inteiro em memória
+    if len(text) > settings.TODO_IMPORT_MAX_RECORD_SIZE:
+        raise HTTPException(
+            status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+            detail='import record too large',
+        )
+
+
+async def text_lines(chunks):
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    pending = ''
+
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split('\n')
+        for line in lines:
+            ensure_record_size(line)
+            yield line
+        ensure_record_size(pending)
+
+    pending += decoder.decode(b'', final=True)
+    if pending:
+        yield pending
+
+
+async def ndjson_records(lines):
+    row = 0
+
+    async for line in lines:
+        if not line.strip():
+            continue
+
+        row += 1
+        yield row, line
+
+
+def parse_csv_record(text: str):
+    try:
+        return next(csv.reader([text], strict=True), [])
+    except csv.Error as error:
+        # um campo entre aspas pode ter quebras de linha: aspas abertas no
+        # fim do texto querem dizer que o registro continua na próxima linha
+        if str(error) == CSV_INCOMPLETE_RECORD:
+            return None
+        return error
+
+
+async def csv_records(lines):
+    header = None
+    row = 0
+    pending = ''
+
+    async for line in lines:
+        pending += f'{line}\n'
+        ensure_record_size(pending)
+        values = parse_csv_record(pending)
+        if values is None:
+            continue
+
+        pending = ''
+        if values == []:
+            continue
+
+        if header is None:
+            header = [] if isinstance(values, csv.Error) else values
+            continue
+
+        row += 1
+        if isinstance(values, csv.Error):
+            yield row, values
+        else:
+            yield row, dict(zip(header, values))
+
+    if pending:
+        yield row + 1, csv.Error('unterminated quoted field')
+
+
+def validate_record(record: str | dict | csv.Error):
+    if isinstance(record, csv.Error):
+        raise record
+    if isinstance(record, str):
+        return TodoRequest.model_validate_json(record)
+
+    return TodoRequest.model_validate(record)
+
+
+def import_error(row: int, error: ValidationError | csv.Error):
+    if isinstance(error, csv.Error):
+        return TodoImportError(row=row, errors=[str(error)])
+
+    return TodoImportError(
+        row=row,
+        errors=[
+            ': '.join(filter(None, ('.'.join(map(str, e['loc'])), e['msg'])))
+            for e in error.errors()
+        ],
+    )
+
+
+async def copy_todos(session: AsyncSession, todos: list[dict]):
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+
+    async with raw_connection.driver_connection.cursor() as cursor:
+        async with cursor.copy(COPY_TODOS) as copy:
+            for todo in todos:
+                await copy.write_row([todo[name] for name in IMPORT_COLUMNS])
+
+    # o COPY não passa pelo ORM, então o cache não vê a escrita
+    result_cache.invalidate([Todo.__table__])
+
+
+async def write_todos(session: AsyncSession, todos: list[dict]):
+    if session.bind.dialect.name == 'postgresql':
+        await copy_todos(session, todos)
+    else:
+        await session.execute(insert(Todo), todos)
+    await session.commit()
+
+    return len(todos)
+
+
+async def import_todo_records(session: AsyncSession, user_id: int, records):
+    imported, failed, errors = 0, 0, []
+    chunk = []
+
+    async for row, record in records:
+        try:
+            todo = validate_record(record)
+        except (ValidationError, csv.Error) as error:
+            failed += 1
+            if len(errors) < settings.TODO_IMPORT_MAX_ERRORS:
+                errors.append(import_error(row, error))
+            continue
+
+        chunk.append({**todo.model_dump(mode='json'), 'user_id': user_id})
+        if len(chunk) >= settings.TODO_IMPORT_CHUNK_SIZE:
+            imported += await write_todos(session, chunk)
+            chunk = []
+
+    if chunk:
+        imported += await write_todos(session, chunk)
+
+    return imported, failed, errors
+
+
+def encode_sync_token(synced_at: datetime):
+    return urlsafe_b64encode(synced_at.isoformat().encode()).decode()
+
+
+def decode_sync_token(token: str):
+    try:
+        synced_at = datetime.fromisoformat(urlsafe_b64decode(token).decode())
+    except (ValueError, TypeError):
+        synced_at = None
+
+    # os tokens emitidos são sempre naive: um com fuso não veio daqui e não
+    # pode ser comparado com as colunas
+    if synced_at is None or synced_at.tzinfo is not None:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST, detail='invalid sync token'
+        )
+
+    return synced_at
+
+
+def database_now(dialect: str):
+    # mesmo relógio e formato do server_default now() de updated_at e
+    # deleted_at: no postgres now() tem fuso, localtimestamp não
+    if dialect == 'postgresql':
+        return func.localtimestamp()
+
+    return func.now()
+
+
+async def todo_changes(
+    session: AsyncSession, user_id: int, since: datetime | None
+):
+    # o relógio da aplicação pode estar adiantado em relação ao do banco, e
+    # o que foi escrito nessa diferença sumiria de todos os syncs seguintes
+    now = await session.scalar(select(database_now(session.bind.dialect.name)))
+    todos = select(Todo).where(Todo.user_id == user_id)
+
+    if since is None:
+        return (await session.scalars(todos.order_by(Todo.id))).all(), [], now
+
+    if since < now - timedelta(seconds=settings.TODO_TOMBSTONE_RETENTION_SECS):
+        raise HTTPException(
+            status_code=HTTPStatus.GONE,
+            detail='sync token expired, full sync required',
+        )
+
+    # updated_at é o now() do início da transação que escreveu: o que
+    # commitou logo depois do último sync ainda fica dentro da janela
+    window = since - timedelta(seconds=settings.TODO_SYNC_OVERLAP_SECS)
+
+    changed = await session.scalars(
+        todos.where(Todo.updated_at > window).order_by(
+            Todo.updated_at, Todo.id
+        )
+    )
+    deleted = await session.scalars(
+        select(TodoTombstone.todo_id).where(
+            TodoTombstone.user_id == user_id,
+            TodoTombstone.deleted_at > window,
+        )
+    )
+
+    return changed.all(), deleted.all(), now
+
+
+async def purge_tombstones(
+    session: AsyncSession, older_than: timedelta, batch_size: int
+):
+    purged = 0
+
+    while True:
+        expired = (
+            select(TodoTombstone.todo_id)
+            .where(TodoTombstone.deleted_at <= utcnow() - older_than)
+            .limit(batch_size)
+        )
+        result = await session.execute(
+            delete(TodoTombstone).where(TodoTombstone.todo_id.in_(expired))
+        )
+        await session.commit()
+
+        purged += result.rowcount
+        if result.rowcount < batch_size:
+            return purged
+
+
+async def sweep_tombstones():
+    async with AsyncSession(database.engine) as session:
+        await purge_tombstones(
+            session,
+            timedelta(seconds=settings.TODO_TOMBSTONE_RETENTION_SECS),
+            settings.TODO_TOMBSTONE_SWEEP_BATCH_SIZE,
+        )
@@ -1,18 +1,17 @@
 from datetime import datetime
 
-from pwdlib import PasswordHash
-from sqlalchemy import func
+from sqlalchemy import Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from fast_zero.database.tables import table_registry
 from fast_zero.todo.models import Todo
 
-passwd_context = PasswordHash.recommended()
-
 
 @table_registry.mapped_as_dataclass
 class User:
     __tablename__ = 'users'
+    __mapper_args__ = {'eager_defaults': True}
+    __table_args__ = (Index('ix_users_created_at_id', 'created_at', 'id'),)
 
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
     username: Mapped[str] = mapped_column(unique=True)
@@ -20,8 +19,13 @@ class User:
     password: Mapped[str]
     todos: Mapped[list[Todo]] = relationship(
         init=False,
+        default_factory=list,
         cascade='all, delete-orphan',
-        lazy='selectin',
+        passive_deletes=True,
+        lazy='raise',
+        # __repr__/__eq__ do dataclass não podem disparar o lazy='raise'
+        repr=False,
+        compare=False,
     )
 
     created_at: Mapped[datetime] = mapped_column(
@@ -3,12 +3,20 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, Query
 from fastapi.exceptions import HTTPException
-from sqlalchemy import select
+from sqlalchemy import delete, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-
-from fast_zero.auth.security import hash_password, permission_validation
+from sqlalchemy.orm import selectinload
+
+from fast_zero.auth.security import (
+    LazyUser,
+    credential_exception,
+    hash_password_async,
+    permission_validation,
+    principal_cache,
+)
 from fast_zero.commons.filters import FilterPage
+from fast_zero.commons.pagination import paginate, split_page
 from fast_zero.database.config import get_session
 from fast_zero.user.models import User
 from fast_zero.user.schemas import (
@@ -22,7 +30,7 @@ router = APIRouter(prefix='/users', tags=['users'])
 
 Session = Annotated[AsyncSession, Depends(get_session)]
 FilterUser = Annotated[FilterPage, Query()]
-PermissionValidation = Annotated[User, Depends(permission_validation)]
+PermissionValidation = Annotated[LazyUser, Depends(permission_validation)]
 
 
 @router.post('/', status_code=HTTPStatus.CREATED, response_model=UserResponse)
@@ -31,36 +39,38 @@ async def create_user(user: UserRequest, session: Session):
         db_user = User(
             username=user.username,
             email=user.email,
-            password=hash_password(user.password),
+            password=await hash_password_async(user.password),
         )
 
         session.add(db_user)
         await session.commit()
-        await session.refresh(db_user)
-
-        return db_user
     except IntegrityError:
         raise HTTPException(
             status_code=HTTPStatus.CONFLICT,
             detail='username or email already in use',
         )
 
+    # usuário recém-criado: todos já é a lista vazia do default_factory
+    return db_user
+
 
 @router.get('/', status_code=HTTPStatus.OK, response_model=UserList)
 async def list_users(session: Session, filter_user: FilterUser):
     query = await session.scalars(
-        select(User).offset(filter_user.offset).limit(filter_user.limit)
+        paginate(
+            select(User).options(selectinload(User.todos)), User, filter_user
+        )
     )
 
-    users = query.all()
-    return UserList(users=users)
+    users, next_cursor = split_page(query.all(), filter_user.limit)
+    return UserList(users=users, next_cursor=next_cursor)
 
 
 @router.get(
     '/{user_id}', status_code=HTTPStatus.OK, response_model=UserResponse
 )
 async def get_user_by_id(user_id: int, user: PermissionValidation):
-    return user
+    return await user.load(selectinload(User.todos))
 
 
 @router.put(
@@ -69,35 +79,47 @@ async def get_user_by_id(user_id: int, user: PermissionValidation):
 async def update_user(
     user_id: int,
     user: UserRequest,
-    db_user: PermissionValidation,
+    lazy_user: PermissionValidation,
     session: Session,
 ):
+    db_user = await lazy_user.load()
+    old_email = db_user.email
+
     try:
         db_user.username = user.username
         db_user.email = user.email
-        db_user.password = hash_password(user.password)
+        db_user.password = await hash_password_async(user.password)
 
         await session.commit()
-        await session.refresh(db_user)
-
-        return UpdatedUserResponse(
-            id=db_user.id,
-            username=db_user.username,
-            email=db_user.email,
-        )
-
     except IntegrityError:
         raise HTTPException(
             status_code=HTTPStatus.CONFLICT,
             detail='username or email already in use',
         )
 
+    principal_cache.pop(old_email)
+    principal_cache.pop(db_user.email)
+
+    return UpdatedUserResponse(
+        id=db_user.id,
+        username=db_user.username,
+        email=db_user.email,
+    )
+
 
 @router.delete('/{user_id}', status_code=HTTPStatus.NO_CONTENT)
 async def delete_user(
     user_id: int,
-    user: PermissionValidation,
+    lazy_user: PermissionValidation,
     session: Session,
 ):
-    await session.delete(user)
+    email = await session.scalar(
+        delete(User).where(User.id == lazy_user.id).returning(User.email)
+    )
+
+    if email is None:
+        raise credential_exception()
+
     await session.commit()
+
+    principal_cache.pop(email)
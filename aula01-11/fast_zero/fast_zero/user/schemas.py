@@ -30,3 +30,4 @@ class UpdatedUserResponse(BaseModel):
 
 class UserList(BaseModel):
     users: list[UserResponse]
+    next_cursor: str | None = None
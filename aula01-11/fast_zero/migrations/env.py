@@ -6,9 +6,11 @@ from sqlalchemy import pool
 from alembic import context
 
 import asyncio
+import re
 from settings import Settings
+from fast_zero.auth.models import RateLimitBucket, RefreshToken, RevokedToken
 from fast_zero.user.models import User
-from fast_zero.todo.models import Todo
+from fast_zero.todo.models import Todo, TodoArchive, TodoTombstone
 from fast_zero.database.tables import table_registry
 
 # this is the Alembic Config object, which provides
@@ -33,6 +35,19 @@ target_metadata = table_registry.metadata
 # ... etc.
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    # tabela fts5 do sqlite e índices trigram do postgres são criados por
+    # dialeto na migration, fora do que o autogenerate consegue comparar
+    if type_ == 'table' and name.startswith('todos_fts'):
+        return False
+    # partições de todos criadas pela migration de hash partitioning
+    if type_ == 'table' and reflected and re.fullmatch(r'todos_p\d+', name):
+        return False
+    if type_ == 'index' and name.endswith('_trgm'):
+        return context.get_context().dialect.name == 'postgresql'
+    return True
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -50,6 +65,7 @@ def run_migrations_offline() -> None:
         url=url,
         target_metadata=target_metadata,
         literal_binds=True,
+        include_object=include_object,
         dialect_opts={"paramstyle": "named"},
     )
 
@@ -58,7 +74,11 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection):
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+    )
     with context.begin_transaction():
         context.run_migrations()
 
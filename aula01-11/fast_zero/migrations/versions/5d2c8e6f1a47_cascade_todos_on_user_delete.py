@@ -0,0 +1,45 @@
+"""cascade todos on user delete
+
+Revision ID: 5d2c8e6f1a47
+Revises: a71e4b08d3c5
+Create Date: 2025-07-16 11:05:39.614220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2c8e6f1a47'
+down_revision: Union[str, Sequence[str], None] = 'a71e4b08d3c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# a fk foi criada sem nome: no postgres ela se chama todos_user_id_fkey e no
+# sqlite o batch mode usa a convenção para encontrá-la
+naming_convention = {'fk': '%(table_name)s_%(column_0_name)s_fkey'}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table(
+        'todos', naming_convention=naming_convention
+    ) as batch_op:
+        batch_op.drop_constraint('todos_user_id_fkey', type_='foreignkey')
+        batch_op.create_foreign_key(
+            'todos_user_id_fkey', 'users', ['user_id'], ['id'],
+            ondelete='CASCADE',
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table(
+        'todos', naming_convention=naming_convention
+    ) as batch_op:
+        batch_op.drop_constraint('todos_user_id_fkey', type_='foreignkey')
+        batch_op.create_foreign_key(
+            'todos_user_id_fkey', 'users', ['user_id'], ['id'],
+        )
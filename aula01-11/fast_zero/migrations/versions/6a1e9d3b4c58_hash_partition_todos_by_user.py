@@ -0,0 +1,105 @@
+"""hash partition todos by user
+
+Revision ID: 6a1e9d3b4c58
+Revises: 0c8d4f2b7e63
+Create Date: 2025-07-18 09:36:50.271948
+
+Só tem efeito no postgres. O número de partições vem de
+`alembic -x todos_partitions=N upgrade head` (padrão 16).
+
+A cópia roda com todos travada para escrita: em tabelas grandes rode numa
+janela de manutenção.
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a1e9d3b4c58'
+down_revision: Union[str, Sequence[str], None] = '0c8d4f2b7e63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DEFAULT_PARTITIONS = 16
+
+TODOS_INDEXES = (
+    'CREATE INDEX ix_todos_user_id_id ON todos (user_id, id)',
+    'CREATE INDEX ix_todos_user_id_state ON todos (user_id, state)',
+    'CREATE INDEX ix_todos_user_id_created_at_id '
+    'ON todos (user_id, created_at, id)',
+    'CREATE INDEX ix_todos_title_trgm ON todos '
+    'USING gin (title gin_trgm_ops)',
+    'CREATE INDEX ix_todos_description_trgm ON todos '
+    'USING gin (description gin_trgm_ops)',
+)
+
+
+def swap_todos(new_table_ddl: Sequence[str], primary_key: str) -> None:
+    op.execute('LOCK TABLE todos IN EXCLUSIVE MODE')
+
+    for ddl in new_table_ddl:
+        op.execute(ddl)
+    op.execute(
+        f'ALTER TABLE todos_new ADD CONSTRAINT todos_new_pkey '
+        f'PRIMARY KEY ({primary_key})'
+    )
+    op.execute('INSERT INTO todos_new SELECT * FROM todos')
+
+    # a sequence do id é reaproveitada, não pode cair junto com a tabela
+    op.execute('ALTER SEQUENCE todos_id_seq OWNED BY NONE')
+    op.execute('DROP TABLE todos')
+    op.execute('ALTER TABLE todos_new RENAME TO todos')
+    op.execute('ALTER TABLE todos RENAME CONSTRAINT todos_new_pkey TO todos_pkey')
+    op.execute('ALTER SEQUENCE todos_id_seq OWNED BY todos.id')
+
+    op.execute(
+        'ALTER TABLE todos ADD CONSTRAINT todos_user_id_fkey '
+        'FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE'
+    )
+    for ddl in TODOS_INDEXES:
+        op.execute(ddl)
+    op.execute('ANALYZE todos')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    partitions = int(
+        context.get_x_argument(as_dictionary=True).get(
+            'todos_partitions', DEFAULT_PARTITIONS
+        )
+    )
+
+    # a chave de partição precisa fazer parte da pk
+    swap_todos(
+        [
+            'CREATE TABLE todos_new (LIKE todos INCLUDING DEFAULTS '
+            'INCLUDING CONSTRAINTS) PARTITION BY HASH (user_id)',
+            *(
+                f'CREATE TABLE todos_p{remainder} PARTITION OF todos_new '
+                f'FOR VALUES WITH (MODULUS {partitions}, '
+                f'REMAINDER {remainder})'
+                for remainder in range(partitions)
+            ),
+        ],
+        primary_key='id, user_id',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    swap_todos(
+        [
+            'CREATE TABLE todos_new (LIKE todos INCLUDING DEFAULTS '
+            'INCLUDING CONSTRAINTS)',
+        ],
+        primary_key='id',
+    )
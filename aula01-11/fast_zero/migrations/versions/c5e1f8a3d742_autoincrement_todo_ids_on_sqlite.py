@@ -0,0 +1,83 @@
+"""autoincrement todo ids on sqlite
+
+Revision ID: c5e1f8a3d742
+Revises: 7d1c3a9f5b20
+Create Date: 2025-07-24 09:12:40.581733
+
+Só tem efeito no sqlite. Sem AUTOINCREMENT o sqlite reaproveita o rowid do
+maior todo apagado, e o id repetido colide com o tombstone (e com o todo
+arquivado) do todo antigo. No postgres a sequence nunca reaproveita ids.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e1f8a3d742'
+down_revision: Union[str, Sequence[str], None] = '7d1c3a9f5b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# o batch mode recria a tabela: os triggers do fts caem junto com a antiga
+TODOS_FTS_TRIGGERS = (
+    'CREATE TRIGGER todos_fts_insert AFTER INSERT ON todos BEGIN '
+    'INSERT INTO todos_fts(rowid, title, description) '
+    'VALUES (new.id, new.title, new.description); END',
+    'CREATE TRIGGER todos_fts_delete AFTER DELETE ON todos BEGIN '
+    'INSERT INTO todos_fts(todos_fts, rowid, title, description) '
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    'CREATE TRIGGER todos_fts_update AFTER UPDATE OF title, description '
+    'ON todos BEGIN '
+    'INSERT INTO todos_fts(todos_fts, rowid, title, description) '
+    "VALUES ('delete', old.id, old.title, old.description); "
+    'INSERT INTO todos_fts(rowid, title, description) '
+    'VALUES (new.id, new.title, new.description); END',
+)
+
+naming_convention = {'fk': '%(table_name)s_%(column_0_name)s_fkey'}
+
+
+def recreate_todos(autoincrement: bool) -> None:
+    # o batch mode não copia o WHERE do índice parcial
+    op.drop_index('ix_todos_trash_updated_at', table_name='todos')
+
+    with op.batch_alter_table(
+        'todos',
+        recreate='always',
+        naming_convention=naming_convention,
+        table_kwargs={'sqlite_autoincrement': autoincrement},
+    ):
+        pass
+
+    op.create_index('ix_todos_trash_updated_at', 'todos', ['updated_at'], unique=False, sqlite_where=sa.text("state = 'trash'"))
+    for ddl in TODOS_FTS_TRIGGERS:
+        op.execute(ddl)
+    op.execute("INSERT INTO todos_fts(todos_fts) VALUES ('rebuild')")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    recreate_todos(autoincrement=True)
+
+    # ids acima do maior todo vivo já podem ter virado tombstone ou arquivo
+    op.execute("DELETE FROM sqlite_sequence WHERE name = 'todos'")
+    op.execute(
+        "INSERT INTO sqlite_sequence (name, seq) VALUES ('todos', max("
+        '(SELECT coalesce(max(id), 0) FROM todos), '
+        '(SELECT coalesce(max(id), 0) FROM todos_archive), '
+        '(SELECT coalesce(max(todo_id), 0) FROM todo_tombstones)))'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    recreate_todos(autoincrement=False)
@@ -1,6 +1,17 @@
+from typing import Literal
+
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class JWTKey(BaseModel):
+    kid: str
+    algorithm: str
+    secret: str | None = None
+    private_key: str | None = None
+    public_key: str | None = None
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file='.env', env_file_encoding='utf-8'
@@ -9,10 +20,76 @@ class Settings(BaseSettings):
     # App
     DATABASE_URL: str
 
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECS: float = 30
+    DB_POOL_RECYCLE_SECS: int = 30 * 60
+    # o pool aquecido e o pool_recycle já cobrem conexões velhas: o ping a
+    # cada checkout é um round-trip a mais, ligue só onde o banco derruba
+    # conexões ociosas antes do recycle
+    DB_POOL_PRE_PING: bool = False
+    DB_POOL_MIN_CONNECTIONS: int = 0
+    DATABASE_REPLICA_URLS: list[str] = []
+    DB_REPLICA_SELECTION: Literal['round_robin', 'least_connections'] = (
+        'round_robin'
+    )
+    DB_REPLICA_COOLDOWN_SECS: float = 30
+    DB_READ_YOUR_WRITES_SECS: float = 5
+    DB_READ_YOUR_WRITES_MAX_KEYS: int = 10_000
+    RESULT_CACHE_ENABLED: bool = False
+    RESULT_CACHE_MAX_SIZE: int = 4096
+    RESULT_CACHE_TTL_SECS: int = 30
+    BACKGROUND_JOBS_ENABLED: bool = True
+
     # Security
     SECRET_KEY: str
     ALGORITHM: str
     TOKEN_TIME_EXPIRATION_SECS: int
+    REFRESH_TOKEN_TIME_EXPIRATION_SECS: int = 30 * 24 * 60 * 60
+    REFRESH_TOKEN_SWEEP_INTERVAL_SECS: int = 60 * 60
+    REFRESH_TOKEN_SWEEP_BATCH_SIZE: int = 1000
+    JWT_KEYS: list[JWTKey] = []
+    JWT_ACTIVE_KID: str | None = None
+    PRINCIPAL_CACHE_TTL_SECS: int = 60
+    PRINCIPAL_CACHE_MAX_SIZE: int = 1024
+    TOKEN_CACHE_MAX_SIZE: int = 4096
+    REVOCATION_BLOOM_CAPACITY: int = 100_000
+    REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+    REVOCATION_REBUILD_INTERVAL_SECS: int = 30
+
+    # Todos
+    TODO_ARCHIVE_AFTER_SECS: int = 30 * 24 * 60 * 60
+    TODO_ARCHIVE_INTERVAL_SECS: int = 60 * 60
+    TODO_ARCHIVE_BATCH_SIZE: int = 1000
+    TODO_BULK_MAX_SIZE: int = 500
+    TODO_EXPORT_BATCH_SIZE: int = 1000
+    TODO_IMPORT_CHUNK_SIZE: int = 5000
+    TODO_IMPORT_MAX_ERRORS: int = 100
+    TODO_IMPORT_MAX_RECORD_SIZE: int = 64 * 1024
+    TODO_SYNC_OVERLAP_SECS: int = 5
+    TODO_TOMBSTONE_RETENTION_SECS: int = 30 * 24 * 60 * 60
+    TODO_TOMBSTONE_SWEEP_INTERVAL_SECS: int = 60 * 60
+    TODO_TOMBSTONE_SWEEP_BATCH_SIZE: int = 1000
+
+    # Login rate limit
+    LOGIN_RATE_LIMIT_STORE: Literal['memory', 'database'] = 'memory'
+    LOGIN_RATE_LIMIT_MAX_KEYS: int = 10_000
+    LOGIN_IP_BURST: int = 20
+    LOGIN_IP_PER_MINUTE: int = 20
+    LOGIN_EMAIL_BURST: int = 5
+    LOGIN_EMAIL_PER_MINUTE: int = 5
+    # atrás de proxy request.client é o proxy: o IP real vem do header que
+    # ele preenche (Fly-Client-IP) ou dos últimos hops do X-Forwarded-For
+    CLIENT_IP_HEADER: str | None = None
+    TRUSTED_PROXY_HOPS: int = 0
+
+    # Password hashing
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 4
+    PASSWORD_HASH_EXECUTOR: Literal['thread', 'process'] = 'thread'
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
 
 
 settings = Settings()
@@ -0,0 +1,25 @@
+from fast_zero.auth.calibrate import MIN_MEMORY_MIB, calibrate
+
+
+def test_calibrate_within_budget():
+    budget_ms = 10_000
+    max_time_cost = 2
+    time_cost, memory_cost, parallelism, elapsed = calibrate(
+        budget_ms=budget_ms,
+        max_memory_mib=MIN_MEMORY_MIB,
+        max_time_cost=max_time_cost,
+    )
+
+    assert time_cost == max_time_cost
+    assert memory_cost == MIN_MEMORY_MIB * 1024
+    assert parallelism == 1
+    assert elapsed < budget_ms
+
+
+def test_calibrate_reduces_memory_until_floor():
+    time_cost, memory_cost, _, _ = calibrate(
+        budget_ms=0, max_memory_mib=MIN_MEMORY_MIB * 2, rounds=1
+    )
+
+    assert time_cost == 1
+    assert memory_cost == MIN_MEMORY_MIB * 1024
@@ -0,0 +1,113 @@
+import pytest
+from jwt import decode, encode, get_unverified_header
+from jwt.exceptions import InvalidTokenError
+
+from fast_zero.auth.keys import DEFAULT_KID, KeyRing
+from settings import JWTKey, Settings, settings
+
+OLD_KEY = JWTKey(kid='2025-01', algorithm='HS256', secret='old-secret')
+NEW_KEY = JWTKey(kid='2025-06', algorithm='HS512', secret='new-secret')
+
+
+def test_key_ring_from_settings_uses_secret_key():
+    key_ring = KeyRing.from_settings(settings)
+    token = key_ring.encode({'sub': 'teste@email.com'})
+
+    decoded_token = decode(
+        token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+    )
+
+    assert get_unverified_header(token)['kid'] == DEFAULT_KID
+    assert decoded_token['sub'] == 'teste@email.com'
+
+
+def test_key_ring_from_settings_with_jwt_keys():
+    key_ring = KeyRing.from_settings(
+        Settings(JWT_KEYS=[OLD_KEY, NEW_KEY], JWT_ACTIVE_KID=NEW_KEY.kid)
+    )
+
+    assert key_ring.active.kid == NEW_KEY.kid
+
+
+def test_key_ring_rotation_keeps_old_tokens_valid():
+    old_ring = KeyRing([OLD_KEY], OLD_KEY.kid)
+    token = old_ring.encode({'sub': 'teste@email.com'})
+
+    rotated_ring = KeyRing([OLD_KEY, NEW_KEY], NEW_KEY.kid)
+    new_token = rotated_ring.encode({'sub': 'teste@email.com'})
+
+    assert rotated_ring.decode(token)['sub'] == 'teste@email.com'
+    assert get_unverified_header(new_token)['kid'] == NEW_KEY.kid
+
+
+def test_key_ring_with_unknown_kid():
+    token = KeyRing([NEW_KEY], NEW_KEY.kid).encode({'sub': 'teste'})
+
+    other_key = JWTKey(kid='other', algorithm='HS256', secret='other')
+
+    with pytest.raises(InvalidTokenError, match='unknown key id'):
+        KeyRing([OLD_KEY, other_key], OLD_KEY.kid).decode(token)
+
+
+def test_key_ring_rejects_algorithm_from_token_header():
+    token = encode(
+        {'sub': 'teste'},
+        'old-secret',
+        algorithm='HS512',
+        headers={'kid': OLD_KEY.kid},
+    )
+
+    with pytest.raises(InvalidTokenError):
+        KeyRing([OLD_KEY], OLD_KEY.kid).decode(token)
+
+
+def test_key_ring_with_none_algorithm():
+    with pytest.raises(ValueError, match='not allowed'):
+        KeyRing([JWTKey(kid='none', algorithm='none')], 'none')
+
+
+@pytest.mark.parametrize('algorithm', ['EdDSA', 'ES256'])
+def test_key_ring_with_asymmetric_keys(algorithm):
+    serialization = pytest.importorskip(
+        'cryptography.hazmat.primitives.serialization'
+    )
+    ec = pytest.importorskip('cryptography.hazmat.primitives.asymmetric.ec')
+    ed25519 = pytest.importorskip(
+        'cryptography.hazmat.primitives.asymmetric.ed25519'
+    )
+
+    private_key = (
+        ed25519.Ed25519PrivateKey.generate()
+        if algorithm == 'EdDSA'
+        else ec.generate_private_key(ec.SECP256R1())
+    )
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = (
+        private_key
+        .public_key()
+        .public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode()
+    )
+
+    signer = KeyRing(
+        [JWTKey(kid='asym', algorithm=algorithm, private_key=private_pem)],
+        'asym',
+    )
+    token = signer.encode({'sub': 'teste@email.com'})
+
+    verifier = KeyRing(
+        [
+            NEW_KEY,
+            JWTKey(kid='asym', algorithm=algorithm, public_key=public_pem),
+        ],
+        NEW_KEY.kid,
+    )
+
+    assert verifier.decode(token)['sub'] == 'teste@email.com'
@@ -0,0 +1,139 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from freezegun import freeze_time
+from starlette.requests import Request
+
+from fast_zero.auth.limiter import (
+    Bucket,
+    DatabaseBucketStore,
+    MemoryBucketStore,
+    client_ip,
+    login_limiter,
+)
+from settings import settings
+
+BUCKET = Bucket(capacity=2, refill_rate=1 / 60)
+
+
+def login(client, username, password):
+    return client.post(
+        '/auth/token', data={'username': username, 'password': password}
+    )
+
+
+def test_login_rate_limited_per_email(client, user):
+    for _ in range(login_limiter.per_email.capacity):
+        response = login(client, user.email, 'wrong_pass')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    response = login(client, user.email, user.plain_password)
+
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert response.json() == {
+        'detail': 'Too many login attempts, try again later'
+    }
+    assert int(response.headers['Retry-After']) > 0
+
+
+def test_login_rate_limited_per_ip(client, user, monkeypatch):
+    monkeypatch.setattr(login_limiter, 'per_ip', BUCKET)
+
+    for n in range(BUCKET.capacity):
+        response = login(client, f'user{n}@email.com', 'any_pass')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    response = login(client, user.email, user.plain_password)
+
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+
+
+def test_login_rate_limited_per_client_ip_header(client, user, monkeypatch):
+    monkeypatch.setattr(login_limiter, 'per_ip', BUCKET)
+    monkeypatch.setattr(settings, 'CLIENT_IP_HEADER', 'Fly-Client-IP')
+
+    for n in range(BUCKET.capacity):
+        response = client.post(
+            '/auth/token',
+            data={'username': f'user{n}@email.com', 'password': 'any_pass'},
+            headers={'Fly-Client-IP': '203.0.113.1'},
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    response = client.post(
+        '/auth/token',
+        data={'username': user.email, 'password': user.plain_password},
+        headers={'Fly-Client-IP': '203.0.113.2'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+
+
+def make_request(headers):
+    return Request({
+        'type': 'http',
+        'headers': [
+            (name.lower().encode(), value.encode())
+            for name, value in headers.items()
+        ],
+        'client': ('10.0.0.1', 1234),
+    })
+
+
+@pytest.mark.parametrize(
+    ('header', 'hops', 'headers', 'expected'),
+    [
+        (None, 0, {}, '10.0.0.1'),
+        (None, 0, {'X-Forwarded-For': '1.1.1.1'}, '10.0.0.1'),
+        ('Fly-Client-IP', 0, {'Fly-Client-IP': '2.2.2.2'}, '2.2.2.2'),
+        ('Fly-Client-IP', 0, {}, '10.0.0.1'),
+        (None, 1, {'X-Forwarded-For': '1.1.1.1, 2.2.2.2'}, '2.2.2.2'),
+        (None, 2, {'X-Forwarded-For': '1.1.1.1, 2.2.2.2'}, '1.1.1.1'),
+        (None, 2, {'X-Forwarded-For': '2.2.2.2'}, '10.0.0.1'),
+    ],
+)
+def test_client_ip(monkeypatch, header, hops, headers, expected):
+    monkeypatch.setattr(settings, 'CLIENT_IP_HEADER', header)
+    monkeypatch.setattr(settings, 'TRUSTED_PROXY_HOPS', hops)
+
+    assert client_ip(make_request(headers)) == expected
+
+
+@pytest.mark.asyncio
+async def test_memory_bucket_store_refill():
+    store = MemoryBucketStore(max_keys=10)
+
+    with freeze_time('2025-07-14 12:00:00') as frozen_time:
+        assert not await store.take('key', BUCKET)
+        assert not await store.take('key', BUCKET)
+        assert await store.take('key', BUCKET) == pytest.approx(60)
+
+        frozen_time.tick(delta=timedelta(seconds=60))
+
+        assert not await store.take('key', BUCKET)
+
+
+@pytest.mark.asyncio
+async def test_memory_bucket_store_evicts_oldest_key():
+    store = MemoryBucketStore(max_keys=1)
+    single_token = Bucket(capacity=1, refill_rate=1 / 60)
+
+    await store.take('first', single_token)
+    await store.take('second', single_token)
+
+    assert not await store.take('first', single_token)
+
+
+@pytest.mark.asyncio
+async def test_database_bucket_store(engine, session):
+    store = DatabaseBucketStore(engine)
+
+    with freeze_time('2025-07-14 12:00:00') as frozen_time:
+        assert not await store.take('key', BUCKET)
+        assert not await store.take('key', BUCKET)
+        assert await store.take('key', BUCKET) == pytest.approx(60)
+
+        frozen_time.tick(delta=timedelta(seconds=60))
+
+        assert not await store.take('key', BUCKET)
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from fast_zero.auth.models import RevokedToken
+from fast_zero.auth.revocation import (
+    is_revoked,
+    revocation_list,
+    revoke_token,
+)
+
+
+@pytest.mark.asyncio
+async def test_rebuild_skips_expired_tokens(session):
+    session.add_all([
+        RevokedToken(
+            jti='revoked', expires_at=datetime.now() + timedelta(hours=1)
+        ),
+        RevokedToken(
+            jti='expired', expires_at=datetime.now() - timedelta(hours=1)
+        ),
+    ])
+    await session.commit()
+
+    await revocation_list.rebuild(session)
+
+    assert revocation_list.ready
+    assert revocation_list.might_contain('revoked')
+    assert not revocation_list.might_contain('expired')
+
+
+@pytest.mark.asyncio
+async def test_is_revoked_without_filter_checks_database(session):
+    exp = int((datetime.now() + timedelta(hours=1)).timestamp())
+    await revoke_token(session, 'revoked', exp)
+
+    assert not revocation_list.ready
+    assert await is_revoked(session, 'revoked')
+    assert not await is_revoked(session, 'other')
+
+
+@pytest.mark.asyncio
+async def test_is_revoked_filter_miss_skips_database(session):
+    await revocation_list.rebuild(session)
+    statements = []
+
+    def count(*args):
+        statements.append(args)
+
+    sync_engine = session.bind.sync_engine
+    event.listen(sync_engine, 'before_cursor_execute', count)
+    try:
+        revoked = await is_revoked(session, 'not-revoked')
+    finally:
+        event.remove(sync_engine, 'before_cursor_execute', count)
+
+    assert not revoked
+    assert not statements
+
+
+@pytest.mark.asyncio
+async def test_revoke_token_updates_ready_filter(session):
+    await revocation_list.rebuild(session)
+    exp = int((datetime.now() + timedelta(hours=1)).timestamp())
+
+    await revoke_token(session, 'revoked', exp)
+
+    assert revocation_list.might_contain('revoked')
+    assert await is_revoked(session, 'revoked')
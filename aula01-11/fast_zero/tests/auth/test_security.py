@@ -5,13 +5,20 @@ import pytest
 from fastapi.exceptions import HTTPException
 from freezegun import freeze_time
 from jwt import decode
+from sqlalchemy import inspect
 
 from fast_zero.auth.security import (
+    PasswordHashPool,
     create_access_token,
+    decode_access_token,
     get_current_user,
     hash_password,
+    hash_password_async,
+    principal_cache,
     settings,
+    token_cache,
     verify_password,
+    verify_password_async,
 )
 
 
@@ -23,6 +30,23 @@ def test_hash_password():
     assert verify_password(plain_password, hashed_password)
 
 
+@pytest.mark.asyncio
+async def test_hash_password_async():
+    plain_password = '123@asd'
+    hashed_password = await hash_password_async(plain_password)
+
+    assert plain_password != hashed_password
+    assert await verify_password_async(plain_password, hashed_password)
+
+
+@pytest.mark.asyncio
+async def test_password_hash_pool_when_saturated():
+    pool = PasswordHashPool(executor='thread', workers=1, max_pending=0)
+
+    with pytest.raises(HTTPException, match='Server busy'):
+        await pool.run(hash_password, '123@asd')
+
+
 def test_create_access_token():
     token, _ = create_access_token(data={'sub': 'teste@email.com'})
 
@@ -50,6 +74,32 @@ def test_create_access_token_with_valid_expiration_time():
     assert expires_in == int(expected_exp.timestamp())
 
 
+def test_decode_access_token_from_cache():
+    token, _ = create_access_token(data={'sub': 'teste@email.com'})
+
+    first = decode_access_token(token)
+    second = decode_access_token(token)
+
+    assert first == second
+    assert token_cache.misses == 1
+    assert token_cache.hits == 1
+
+
+def test_decode_access_token_cache_expires_with_token():
+    with freeze_time('2025-06-27 12:00:00') as frozen_time:
+        token, _ = create_access_token(data={'sub': 'teste@email.com'})
+        decode_access_token(token)
+
+        frozen_time.tick(
+            delta=timedelta(seconds=settings.TOKEN_TIME_EXPIRATION_SECS)
+        )
+
+        with pytest.raises(
+            HTTPException, match='Could not validate credentials'
+        ):
+            decode_access_token(token)
+
+
 @pytest.mark.asyncio
 async def test_get_current_user(session, user):
     token, _ = create_access_token(data={'sub': user.email})
@@ -58,6 +108,53 @@ async def test_get_current_user(session, user):
     assert current_user.id == user.id
 
 
+@pytest.mark.asyncio
+async def test_get_current_user_loads_only_principal_columns(session, user):
+    token, _ = create_access_token(data={'sub': user.email})
+    session.expunge_all()
+
+    current_user = await get_current_user(session, token)
+
+    assert inspect(current_user).unloaded == {
+        'password',
+        'todos',
+        'created_at',
+        'updated_at',
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_from_principal_cache(session, user):
+    token, _ = create_access_token(data={'sub': user.email})
+
+    await get_current_user(session, token)
+    session.expunge_all()
+    current_user = await get_current_user(session, token)
+
+    assert current_user.id == user.id
+    assert current_user.email == user.email
+    assert principal_cache.misses == 1
+    assert principal_cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_principal_cache_ttl_capped_at_token_expiration(
+    session, user, monkeypatch
+):
+    expiration = timedelta(seconds=settings.TOKEN_TIME_EXPIRATION_SECS)
+    monkeypatch.setattr(principal_cache, 'ttl', expiration.seconds * 2)
+
+    with freeze_time('2025-06-27 12:00:00') as frozen_time:
+        token, _ = create_access_token(data={'sub': user.email})
+        await get_current_user(session, token)
+
+        assert principal_cache.get(user.email) is not None
+
+        frozen_time.tick(delta=expiration)
+
+        assert principal_cache.get(user.email) is None
+
+
 @pytest.mark.asyncio
 async def test_get_current_user_with_invalid_token(session):
     token = 'invalid_token'
@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+import pytest
+from freezegun import freeze_time
+from sqlalchemy import func, select
+
+from fast_zero.auth.models import RefreshToken
+from fast_zero.auth.service import (
+    issue_refresh_token,
+    purge_expired_refresh_tokens,
+    rotate_refresh_token,
+)
+from settings import settings
+
+
+@pytest.mark.asyncio
+async def test_rotate_refresh_token(session, user):
+    token = issue_refresh_token(session, user.id)
+    await session.commit()
+
+    new_token, user_id, email, family_id = await rotate_refresh_token(
+        session, token
+    )
+
+    assert new_token != token
+    assert user_id == user.id
+    assert email == user.email
+    assert family_id
+
+
+@pytest.mark.asyncio
+async def test_purge_expired_refresh_tokens(session, user):
+    expired_tokens = 5
+    expiration = timedelta(seconds=settings.REFRESH_TOKEN_TIME_EXPIRATION_SECS)
+
+    with freeze_time('2025-06-30 12:00:00') as frozen_time:
+        for _ in range(expired_tokens):
+            issue_refresh_token(session, user.id)
+        await session.commit()
+
+        frozen_time.tick(expiration)
+        issue_refresh_token(session, user.id)
+        await session.commit()
+
+        purged = await purge_expired_refresh_tokens(session, batch_size=2)
+
+    remaining = await session.scalar(select(func.count(RefreshToken.id)))
+
+    assert purged == expired_tokens
+    assert remaining == 1
@@ -3,6 +3,12 @@ from http import HTTPStatus
 
 import pytest
 from freezegun import freeze_time
+from jwt import decode
+from pwdlib.hashers.argon2 import Argon2Hasher
+
+from fast_zero.auth.security import passwd_context
+from settings import settings
+from tests.conftest import UserFactory
 
 
 def test_create_token(client, user):
@@ -22,6 +28,47 @@ def test_create_token(client, user):
     assert 'expires_in' in data
 
 
+def test_create_token_with_user_id_claim(client, user):
+    response = client.post(
+        '/auth/token',
+        data={
+            'username': user.email,
+            'password': user.plain_password,
+        },
+    )
+
+    decoded_token = decode(
+        response.json()['access_token'],
+        settings.SECRET_KEY,
+        algorithms=[settings.ALGORITHM],
+    )
+
+    assert decoded_token.get('sub') == user.email
+    assert decoded_token.get('uid') == user.id
+
+
+@pytest.mark.asyncio
+async def test_create_token_rehashes_outdated_password(client, session):
+    outdated_hasher = Argon2Hasher(
+        time_cost=1, memory_cost=8192, parallelism=1
+    )
+    user = UserFactory(password=outdated_hasher.hash('123@asd'))
+    session.add(user)
+    await session.commit()
+    outdated_hash = user.password
+
+    response = client.post(
+        '/auth/token',
+        data={'username': user.email, 'password': '123@asd'},
+    )
+    await session.refresh(user)
+
+    assert response.status_code == HTTPStatus.OK
+    assert user.password != outdated_hash
+    assert passwd_context.verify('123@asd', user.password)
+    assert not passwd_context.current_hasher.check_needs_rehash(user.password)
+
+
 def test_create_token_user_not_found(client, user):
     response = client.post(
         '/auth/token',
@@ -48,6 +95,59 @@ def test_create_token_with_invalid_password(client, user):
     assert response.json() == {'detail': 'Invalid username or password'}
 
 
+def test_logout_revokes_access_token(client, token):
+    response_logout = client.post(
+        '/auth/logout', headers={'Authorization': f'Bearer {token}'}
+    )
+    response_todos = client.get(
+        '/todos', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response_logout.status_code == HTTPStatus.NO_CONTENT
+    assert response_todos.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_logout_revokes_refresh_token(client, user):
+    response_token = client.post(
+        '/auth/token',
+        data={'username': user.email, 'password': user.plain_password},
+    )
+    token = response_token.json()['access_token']
+    refresh_token = response_token.json()['refresh_token']
+
+    client.post('/auth/logout', headers={'Authorization': f'Bearer {token}'})
+    response = client.post(
+        '/auth/refresh_token', json={'refresh_token': refresh_token}
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_logout_keeps_other_sessions(client, user, token):
+    other_session = client.post(
+        '/auth/token',
+        data={'username': user.email, 'password': user.plain_password},
+    )
+
+    client.post('/auth/logout', headers={'Authorization': f'Bearer {token}'})
+    response = client.post(
+        '/auth/refresh_token',
+        json={'refresh_token': other_session.json()['refresh_token']},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_logout_twice(client, token):
+    client.post('/auth/logout', headers={'Authorization': f'Bearer {token}'})
+
+    response = client.post(
+        '/auth/logout', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
 def test_refresh_token(client, user):
     with freeze_time('2025-06-30 12:00:00') as frozen_time:
         response_token = client.post(
@@ -60,6 +160,7 @@ def test_refresh_token(client, user):
 
         assert response_token.status_code == HTTPStatus.OK
         token = response_token.json().get('access_token')
+        refresh_token = response_token.json().get('refresh_token')
 
         # TODO: Nota, aidicionado o congelamento de tempo pois nesse caso de
         # geração de token e refresh de token a execução é tão rápida que
@@ -69,16 +170,17 @@ def test_refresh_token(client, user):
 
         response_refresh = client.post(
             '/auth/refresh_token',
-            headers={'Authorization': f'Bearer {token}'},
+            json={'refresh_token': refresh_token},
         )
 
         data = response_refresh.json()
 
         assert response_refresh.status_code == HTTPStatus.OK
         assert data.get('access_token') != token
+        assert data.get('refresh_token') != refresh_token
 
 
-def test_refresh_token_with_expired_token(client, user):
+def test_refresh_token_with_expired_access_token(client, user):
     with freeze_time('2025-06-30 12:00:00') as frozen_time:
         response_token = client.post(
             '/auth/token',
@@ -89,13 +191,38 @@ def test_refresh_token_with_expired_token(client, user):
         )
 
         assert response_token.status_code == HTTPStatus.OK
-        token = response_token.json().get('access_token')
+        refresh_token = response_token.json().get('refresh_token')
 
         frozen_time.tick(timedelta(seconds=301))
 
         response_refresh = client.post(
             '/auth/refresh_token',
-            headers={'Authorization': f'Bearer {token}'},
+            json={'refresh_token': refresh_token},
+        )
+
+        assert response_refresh.status_code == HTTPStatus.OK
+
+
+def test_refresh_token_with_expired_token(client, user):
+    with freeze_time('2025-06-30 12:00:00') as frozen_time:
+        response_token = client.post(
+            '/auth/token',
+            data={
+                'username': user.email,
+                'password': user.plain_password,
+            },
+        )
+
+        assert response_token.status_code == HTTPStatus.OK
+        refresh_token = response_token.json().get('refresh_token')
+
+        frozen_time.tick(
+            timedelta(seconds=settings.REFRESH_TOKEN_TIME_EXPIRATION_SECS)
+        )
+
+        response_refresh = client.post(
+            '/auth/refresh_token',
+            json={'refresh_token': refresh_token},
         )
 
         assert response_refresh.status_code == HTTPStatus.UNAUTHORIZED
@@ -104,6 +231,48 @@ def test_refresh_token_with_expired_token(client, user):
         }
 
 
+def test_refresh_token_with_invalid_token(client):
+    response_refresh = client.post(
+        '/auth/refresh_token',
+        json={'refresh_token': 'invalid_token'},
+    )
+
+    assert response_refresh.status_code == HTTPStatus.UNAUTHORIZED
+    assert response_refresh.json() == {
+        'detail': 'Could not validate credentials'
+    }
+
+
+def test_refresh_token_reuse_revokes_family(client, user):
+    response_token = client.post(
+        '/auth/token',
+        data={
+            'username': user.email,
+            'password': user.plain_password,
+        },
+    )
+    first_refresh_token = response_token.json().get('refresh_token')
+
+    response_refresh = client.post(
+        '/auth/refresh_token',
+        json={'refresh_token': first_refresh_token},
+    )
+    second_refresh_token = response_refresh.json().get('refresh_token')
+
+    response_reuse = client.post(
+        '/auth/refresh_token',
+        json={'refresh_token': first_refresh_token},
+    )
+    response_after_reuse = client.post(
+        '/auth/refresh_token',
+        json={'refresh_token': second_refresh_token},
+    )
+
+    assert response_refresh.status_code == HTTPStatus.OK
+    assert response_reuse.status_code == HTTPStatus.UNAUTHORIZED
+    assert response_after_reuse.status_code == HTTPStatus.UNAUTHORIZED
+
+
 @pytest.mark.asyncio
 async def test_refresh_token_with_user_deleted_token(client, user, session):
     with freeze_time('2025-06-30 12:00:00') as frozen_time:
@@ -116,7 +285,7 @@ async def test_refresh_token_with_user_deleted_token(client, user, session):
         )
 
         assert response_token.status_code == HTTPStatus.OK
-        token = response_token.json().get('access_token')
+        refresh_token = response_token.json().get('refresh_token')
 
         await session.delete(user)
         await session.commit()
@@ -125,7 +294,7 @@ async def test_refresh_token_with_user_deleted_token(client, user, session):
 
         response_refresh = client.post(
             '/auth/refresh_token',
-            headers={'Authorization': f'Bearer {token}'},
+            json={'refresh_token': refresh_token},
         )
 
         assert response_refresh.status_code == HTTPStatus.UNAUTHORIZED
@@ -0,0 +1,24 @@
+from fast_zero.commons.bloom import BloomFilter
+
+
+def test_bloom_filter_contains_added_items():
+    bloom = BloomFilter(capacity=100, error_rate=0.01)
+    items = [f'item-{i}' for i in range(100)]
+
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+
+
+def test_bloom_filter_false_positive_rate():
+    capacity = 1000
+    max_false_positives = 30
+    bloom = BloomFilter(capacity=capacity, error_rate=0.01)
+
+    for i in range(capacity):
+        bloom.add(f'item-{i}')
+
+    false_positives = sum(f'other-{i}' in bloom for i in range(capacity))
+
+    assert false_positives < max_false_positives
@@ -0,0 +1,65 @@
+from datetime import timedelta
+
+from freezegun import freeze_time
+
+from fast_zero.commons.cache import TTLCache
+
+
+def test_cache_get_and_set():
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set('key', 'value')
+
+    assert cache.get('key') == 'value'
+    assert cache.get('missing') is None
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_cache_expires_after_ttl():
+    with freeze_time('2025-06-27 12:00:00') as frozen_time:
+        cache = TTLCache(max_size=2, ttl=60)
+        cache.set('key', 'value')
+
+        frozen_time.tick(delta=timedelta(seconds=60))
+
+        assert cache.get('key') is None
+        assert not len(cache)
+
+
+def test_cache_expires_at_before_ttl():
+    with freeze_time('2025-06-27 12:00:00') as frozen_time:
+        cache = TTLCache(max_size=2, ttl=60)
+        cache.set('key', 'value', expires_at=frozen_time().timestamp() + 10)
+
+        frozen_time.tick(delta=timedelta(seconds=10))
+
+        assert cache.get('key') is None
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set('a', 'value a')
+    cache.set('b', 'value b')
+    cache.get('a')
+    cache.set('c', 'value c')
+
+    assert cache.get('a') == 'value a'
+    assert cache.get('b') is None
+    assert cache.get('c') == 'value c'
+
+
+def test_cache_pop_and_clear():
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set('a', 'value a')
+    cache.set('b', 'value b')
+
+    cache.pop('a')
+    cache.pop('missing')
+
+    assert cache.get('a') is None
+    assert cache.get('b') == 'value b'
+
+    cache.clear()
+
+    assert not len(cache)
+    assert cache.hits == cache.misses == 0
@@ -0,0 +1,20 @@
+from datetime import datetime
+
+import pytest
+from fastapi.exceptions import HTTPException
+
+from fast_zero.commons.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 7, 17, 12, 30, 15, 123456)
+
+    cursor = encode_cursor(created_at, 42)
+
+    assert decode_cursor(cursor) == (created_at, 42)
+
+
+@pytest.mark.parametrize('cursor', ['invalid', 'W10', 'WyJ4IiwgMV0'])
+def test_decode_invalid_cursor(cursor):
+    with pytest.raises(HTTPException, match='invalid cursor'):
+        decode_cursor(cursor)
@@ -0,0 +1,22 @@
+import asyncio
+
+import pytest
+
+from fast_zero.commons.tasks import run_periodically
+
+
+@pytest.mark.asyncio
+async def test_run_periodically_survives_failures():
+    calls = []
+
+    async def job():
+        calls.append(len(calls))
+        if len(calls) == 1:
+            raise RuntimeError('boom')
+
+    task = asyncio.create_task(run_periodically(0, job))
+    while len(calls) < 2:  # noqa: PLR2004
+        await asyncio.sleep(0)
+    task.cancel()
+
+    assert calls == [0, 1]
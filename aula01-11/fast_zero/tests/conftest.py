@@ -1,4 +1,4 @@
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 from datetime import datetime
 
 import factory
@@ -11,12 +11,23 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from testcontainers.postgres import PostgresContainer
 
 from fast_zero.app import app
-from fast_zero.auth.security import hash_password
-from fast_zero.database.config import get_session
+from fast_zero.auth.limiter import login_limiter
+from fast_zero.auth.revocation import revocation_list
+from fast_zero.auth.security import (
+    hash_password,
+    principal_cache,
+    token_cache,
+)
+from fast_zero.database.config import (
+    get_primary_session,
+    get_session,
+    get_session_factory,
+)
 from fast_zero.database.tables import table_registry
 from fast_zero.todo.enums import TodoState
 from fast_zero.todo.models import Todo
 from fast_zero.user.models import User
+from settings import settings
 
 
 class UserFactory(factory.Factory):
@@ -37,6 +48,14 @@ class TodoFactory(factory.Factory):
     state = factory.fuzzy.FuzzyChoice(TodoState)
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    principal_cache.clear()
+    token_cache.clear()
+    login_limiter.store.clear()
+    revocation_list.clear()
+
+
 @pytest_asyncio.fixture
 async def user(session):
     plain_password = '123@asd'
@@ -70,6 +89,21 @@ async def session(engine):
         await conn.run_sync(table_registry.metadata.drop_all)
 
 
+@pytest.fixture
+def statements(session):
+    executed = []
+
+    def log(conn, cursor, statement, *args):
+        executed.append(statement)
+
+    sync_engine = session.bind.sync_engine
+    event.listen(sync_engine, 'before_cursor_execute', log)
+
+    yield executed
+
+    event.remove(sync_engine, 'before_cursor_execute', log)
+
+
 @pytest.fixture
 def mock_db_time():
     return _mock_db_time
@@ -89,12 +123,20 @@ def _mock_db_time(*, model, time=datetime(2025, 6, 27)):
 
 
 @pytest.fixture
-def client(session):
+def client(session, monkeypatch):
+    monkeypatch.setattr(settings, 'BACKGROUND_JOBS_ENABLED', False)
+
     def overrided_session():
         return session
 
+    @asynccontextmanager
+    async def session_factory():
+        yield session
+
     with TestClient(app) as client:
         app.dependency_overrides[get_session] = overrided_session
+        app.dependency_overrides[get_primary_session] = overrided_session
+        app.dependency_overrides[get_session_factory] = lambda: session_factory
         yield client
 
     app.dependency_overrides.clear()
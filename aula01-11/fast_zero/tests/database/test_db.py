@@ -3,6 +3,7 @@ from dataclasses import asdict
 import pytest
 from sqlalchemy import select
 from sqlalchemy.exc import DataError
+from sqlalchemy.orm import selectinload
 
 from fast_zero.todo.models import Todo
 from fast_zero.user.models import User
@@ -22,7 +23,11 @@ async def test_create_user(session, mock_db_time):
         await session.commit()
         await session.refresh(user)
 
-    db_user = await session.scalar(select(User).where(User.id == user.id))
+    db_user = await session.scalar(
+        select(User)
+        .options(selectinload(User.todos))
+        .where(User.id == user.id)
+    )
 
     assert asdict(db_user) == {
         'id': 1,
@@ -88,7 +93,15 @@ async def test_created_user_with_todos(session, user):
 
     session.add(todo)
     await session.commit()
-    await session.refresh(user)
+    await session.refresh(user, ['todos'])
 
     assert len(user.todos) == 1
     assert user.todos[0].title == 'task 1'
+
+
+@pytest.mark.asyncio
+async def test_user_repr_and_eq_skip_todos(session, user):
+    db_user = await session.scalar(select(User).where(User.id == user.id))
+
+    assert 'todos' not in repr(db_user)
+    assert db_user == user
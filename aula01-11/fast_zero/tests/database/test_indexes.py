@@ -0,0 +1,106 @@
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import insert, select, text
+
+from fast_zero.commons.filters import FilterPage
+from fast_zero.commons.pagination import encode_cursor, paginate
+from fast_zero.todo.enums import TodoState
+from fast_zero.todo.models import Todo
+from fast_zero.todo.service import contains_text
+from tests.conftest import UserFactory
+
+USERS = 50
+TODOS_PER_USER = 100
+
+
+@pytest_asyncio.fixture
+async def seeded(session):
+    users = UserFactory.create_batch(USERS)
+    session.add_all(users)
+    await session.commit()
+
+    states = list(TodoState)
+    await session.execute(
+        insert(Todo),
+        [
+            {
+                'title': f'task {n}',
+                'description': 'seeded',
+                'state': states[n % len(states)],
+                'user_id': user.id,
+            }
+            for user in users
+            for n in range(TODOS_PER_USER)
+        ],
+    )
+    await session.commit()
+    await session.execute(text('ANALYZE'))
+
+    return users[0]
+
+
+async def explain(session, query):
+    compiled = query.compile(
+        dialect=session.bind.dialect,
+        compile_kwargs={'literal_binds': True},
+    )
+    prefix = (
+        'EXPLAIN QUERY PLAN'
+        if session.bind.dialect.name == 'sqlite'
+        else 'EXPLAIN'
+    )
+    result = await session.execute(text(f'{prefix} {compiled}'))
+
+    return '\n'.join(str(row[-1]) for row in result)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ('index', 'build_query'),
+    [
+        (
+            'ix_todos_user_id_id',
+            lambda user: (
+                select(Todo)
+                .where(Todo.user_id == user.id)
+                .order_by(Todo.id)
+                .limit(20)
+            ),
+        ),
+        (
+            'ix_todos_user_id_state',
+            lambda user: select(Todo).where(
+                Todo.user_id == user.id, Todo.state == TodoState.done
+            ),
+        ),
+        (
+            'ix_todos_user_id_created_at_id',
+            lambda user: paginate(
+                select(Todo).where(Todo.user_id == user.id),
+                Todo,
+                FilterPage(cursor=encode_cursor(datetime(2025, 1, 1), 1)),
+            ),
+        ),
+    ],
+)
+async def test_todo_queries_use_per_user_indexes(
+    session, seeded, index, build_query
+):
+    plan = await explain(session, build_query(seeded))
+
+    assert index in plan
+
+
+@pytest.mark.asyncio
+async def test_text_search_uses_text_index(session, seeded):
+    dialect = session.bind.dialect.name
+    query = select(Todo).where(contains_text(Todo.title, 'needle', dialect))
+
+    plan = await explain(session, query)
+
+    if dialect == 'sqlite':
+        assert 'todos_fts VIRTUAL TABLE INDEX 0:M' in plan
+    else:
+        assert 'ix_todos_title_trgm' in plan
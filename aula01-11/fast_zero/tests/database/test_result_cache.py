@@ -0,0 +1,136 @@
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import delete, select
+
+from fast_zero.database.cache import ResultCache
+from fast_zero.todo.models import Todo
+from fast_zero.user.models import User
+from tests.conftest import TodoFactory
+
+
+@pytest.fixture
+def result_cache():
+    cache = ResultCache(max_size=16, ttl=60)
+    cache.install(User, Todo)
+
+    yield cache
+
+    cache.uninstall()
+
+
+def selected_tables(statements):
+    return [
+        statement.split('FROM ')[1].split()[0]
+        for statement in statements
+        if statement.startswith('SELECT')
+    ]
+
+
+def todos_of(user):
+    return (
+        select(Todo)
+        .where(Todo.user_id == user.id)
+        .order_by(Todo.id)
+        .execution_options(result_cache=True)
+    )
+
+
+@pytest.mark.asyncio
+async def test_result_cache_hit(session, user, result_cache, statements):
+    session.add_all(TodoFactory.create_batch(3, user_id=user.id))
+    await session.commit()
+
+    first = (await session.scalars(todos_of(user))).all()
+    second = (await session.scalars(todos_of(user))).all()
+
+    assert [todo.id for todo in first] == [todo.id for todo in second]
+    assert selected_tables(statements) == ['todos']
+    assert result_cache.entries.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_result_cache_keys_on_parameters(
+    session, user, result_cache, statements
+):
+    await session.scalar(
+        select(User)
+        .where(User.email == user.email)
+        .execution_options(result_cache=True)
+    )
+    other = await session.scalar(
+        select(User)
+        .where(User.email == 'other@email.com')
+        .execution_options(result_cache=True)
+    )
+
+    assert other is None
+    assert selected_tables(statements).count('users') == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_result_cache_requires_execution_option(
+    session, user, result_cache, statements
+):
+    query = select(User).where(User.id == user.id)
+
+    await session.scalar(query)
+    await session.scalar(query)
+
+    assert selected_tables(statements).count('users') == 2  # noqa: PLR2004
+    assert not len(result_cache.entries)
+
+
+@pytest.mark.asyncio
+async def test_result_cache_invalidated_by_flush(session, user, result_cache):
+    session.add(TodoFactory(user_id=user.id))
+    await session.commit()
+    await session.scalars(todos_of(user))
+
+    session.add(TodoFactory(user_id=user.id))
+    await session.commit()
+
+    todos = (await session.scalars(todos_of(user))).all()
+
+    assert len(todos) == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_result_cache_invalidated_by_cascading_delete(
+    session, user, result_cache
+):
+    session.add(TodoFactory(user_id=user.id))
+    await session.commit()
+    await session.scalars(todos_of(user))
+
+    await session.execute(delete(User).where(User.id == user.id))
+    await session.commit()
+    session.expunge_all()
+
+    todos = (await session.scalars(todos_of(user))).all()
+
+    assert todos == []
+
+
+@pytest.mark.asyncio
+async def test_result_cache_skips_sessions_with_pending_writes(
+    session, user, result_cache
+):
+    session.add(TodoFactory(user_id=user.id))
+    await session.flush()
+
+    await session.scalars(todos_of(user))
+
+    assert not len(result_cache.entries)
+
+    await session.rollback()
+
+
+def test_result_cache_skips_login_lookup(client, user, result_cache):
+    response = client.post(
+        '/auth/token',
+        data={'username': user.email, 'password': user.plain_password},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert not len(result_cache.entries)
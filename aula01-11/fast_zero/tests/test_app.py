@@ -0,0 +1,27 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from fast_zero.app import app
+from settings import settings
+
+
+@pytest.mark.parametrize(('enabled', 'jobs'), [(True, 4), (False, 0)])
+def test_lifespan_background_jobs(monkeypatch, enabled, jobs):
+    started = []
+
+    def run_periodically(interval, job, **kwargs):
+        started.append(job)
+        return asyncio.sleep(0)
+
+    monkeypatch.setattr('fast_zero.app.run_periodically', run_periodically)
+    monkeypatch.setattr(settings, 'BACKGROUND_JOBS_ENABLED', enabled)
+    monkeypatch.setattr(
+        settings, 'DATABASE_URL', 'sqlite+aiosqlite:///:memory:'
+    )
+
+    with TestClient(app):
+        pass
+
+    assert len(started) == jobs
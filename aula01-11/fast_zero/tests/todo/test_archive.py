@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from fast_zero.todo.models import Todo, TodoArchive
+from fast_zero.todo.service import archive_trash_todos, restore_todo
+from tests.conftest import TodoFactory
+
+
+@pytest.mark.asyncio
+async def test_archive_trash_todos(session, user, mock_db_time):
+    old_trash = 5
+
+    with mock_db_time(model=Todo, time=datetime(2025, 1, 1)):
+        session.add_all(
+            TodoFactory.create_batch(old_trash, user_id=user.id, state='trash')
+        )
+        session.add(TodoFactory(user_id=user.id, state='done'))
+        await session.commit()
+
+    session.add(TodoFactory(user_id=user.id, state='trash'))
+    await session.commit()
+
+    archived = await archive_trash_todos(
+        session, older_than=timedelta(days=30), batch_size=2
+    )
+
+    todos = (await session.scalars(select(Todo.state))).all()
+    archive = (await session.scalars(select(TodoArchive))).all()
+
+    assert archived == old_trash
+    assert sorted(todos) == ['done', 'trash']
+    assert len(archive) == old_trash
+    assert all(todo.state == 'trash' for todo in archive)
+
+
+@pytest.mark.asyncio
+async def test_restore_todo(session, user, mock_db_time):
+    with mock_db_time(model=Todo, time=datetime(2025, 1, 1)) as time:
+        todo = TodoFactory(user_id=user.id, state='trash')
+        session.add(todo)
+        await session.commit()
+
+    todo_id = todo.id
+    await archive_trash_todos(session, timedelta(days=30), batch_size=10)
+
+    restored = await restore_todo(session, todo_id, user.id)
+
+    assert restored.id == todo_id
+    assert restored.state == 'todo'
+    assert restored.created_at == time
+    assert await session.get(TodoArchive, todo_id) is None
+
+
+@pytest.mark.asyncio
+async def test_restore_todo_from_another_user(session, user, mock_db_time):
+    with mock_db_time(model=Todo, time=datetime(2025, 1, 1)):
+        todo = TodoFactory(user_id=user.id, state='trash')
+        session.add(todo)
+        await session.commit()
+
+    await archive_trash_todos(session, timedelta(days=30), batch_size=10)
+
+    assert await restore_todo(session, todo.id, user.id + 1) is None
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import func, select
+
+from fast_zero.commons.clock import utcnow
+from fast_zero.todo.models import Todo, TodoTombstone
+from fast_zero.todo.service import (
+    archive_trash_todos,
+    purge_tombstones,
+    restore_todo,
+)
+from tests.conftest import TodoFactory
+
+
+@pytest.mark.asyncio
+async def test_archive_and_restore_keep_tombstones(
+    session, user, mock_db_time
+):
+    with mock_db_time(model=Todo, time=datetime(2025, 1, 1)):
+        todo = TodoFactory(user_id=user.id, state='trash')
+        session.add(todo)
+        await session.commit()
+
+    await archive_trash_todos(session, timedelta(days=30), batch_size=10)
+    buried = await session.scalars(select(TodoTombstone.todo_id))
+
+    assert buried.all() == [todo.id]
+
+    await restore_todo(session, todo.id, user.id)
+    remaining = await session.scalar(select(func.count(TodoTombstone.todo_id)))
+
+    assert remaining == 0
+
+
+@pytest.mark.asyncio
+async def test_purge_tombstones(session, user):
+    expired_tombstones = 3
+    retention = timedelta(days=30)
+
+    for n in range(expired_tombstones + 1):
+        tombstone = TodoTombstone(todo_id=n, user_id=user.id)
+        if n < expired_tombstones:
+            tombstone.deleted_at = utcnow() - retention - timedelta(days=1)
+        session.add(tombstone)
+    await session.commit()
+
+    purged = await purge_tombstones(session, retention, batch_size=2)
+    remaining = await session.scalar(select(func.count(TodoTombstone.todo_id)))
+
+    assert purged == expired_tombstones
+    assert remaining == 1
+
+
+@pytest.mark.asyncio
+async def test_delete_create_and_delete_again(client, token, session):
+    headers = {'Authorization': f'Bearer {token}'}
+    todo = {'title': 'task', 'description': 'again', 'state': 'todo'}
+    ids = []
+
+    for _ in range(2):
+        todo_id = client.post('/todos', json=todo, headers=headers).json()[
+            'id'
+        ]
+        response = client.delete(f'/todos/{todo_id}', headers=headers)
+
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        ids.append(todo_id)
+
+    buried = await session.scalars(
+        select(TodoTombstone.todo_id).order_by(TodoTombstone.todo_id)
+    )
+
+    assert ids[0] != ids[1]
+    assert buried.all() == ids
+
+
+@pytest.mark.asyncio
+async def test_restore_after_creating_another_todo(
+    session, user, mock_db_time
+):
+    with mock_db_time(model=Todo, time=datetime(2025, 1, 1)):
+        todo = TodoFactory(user_id=user.id, state='trash')
+        session.add(todo)
+        await session.commit()
+
+    await archive_trash_todos(session, timedelta(days=30), batch_size=10)
+    other = TodoFactory(user_id=user.id)
+    session.add(other)
+    await session.commit()
+
+    restored = await restore_todo(session, todo.id, user.id)
+
+    assert other.id != todo.id
+    assert restored.id == todo.id
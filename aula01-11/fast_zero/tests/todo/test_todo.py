@@ -1,9 +1,22 @@
+import csv
+import io
+import json
+from datetime import UTC, datetime, timedelta
 from http import HTTPStatus
 
 import pytest
+import pytest_asyncio
+from sqlalchemy import select
 
+from fast_zero.commons.clock import utcnow
 from fast_zero.todo.models import Todo
-from tests.conftest import TodoFactory
+from fast_zero.todo.service import (
+    archive_trash_todos,
+    decode_sync_token,
+    encode_sync_token,
+)
+from settings import settings
+from tests.conftest import TodoFactory, UserFactory
 
 
 def test_create_todo(client, token, mock_db_time):
@@ -29,6 +42,25 @@ def test_create_todo(client, token, mock_db_time):
     }
 
 
+def test_create_todo_fetches_defaults_on_insert(client, token, statements):
+    response = client.post(
+        '/todos',
+        json={
+            'title': 'my task',
+            'description': 'first task',
+            'state': 'todo',
+        },
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    todo_statements = [s for s in statements if 'todos' in s]
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert len(todo_statements) == 1
+    assert todo_statements[0].startswith('INSERT INTO todos')
+    assert 'RETURNING' in todo_statements[0]
+
+
 def test_create_todo_with_invalid_state(client, token):
     response = client.post(
         '/todos',
@@ -43,6 +75,53 @@ def test_create_todo_with_invalid_state(client, token):
     assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
 
 
+def test_create_todos_in_bulk(client, token, statements):
+    todos = [
+        {'title': f'task {n}', 'description': 'bulk', 'state': 'todo'}
+        for n in range(3)
+    ]
+
+    response = client.post(
+        '/todos/bulk',
+        json=todos,
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    todo_statements = [s for s in statements if 'todos' in s]
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert [todo['title'] for todo in response.json()['todos']] == [
+        todo['title'] for todo in todos
+    ]
+    assert len(todo_statements) == 1
+    assert todo_statements[0].startswith('INSERT INTO todos')
+
+
+@pytest.mark.parametrize('size', [0, settings.TODO_BULK_MAX_SIZE + 1])
+def test_create_todos_in_bulk_with_invalid_size(client, token, size):
+    response = client.post(
+        '/todos/bulk',
+        json=[{'title': 'task', 'description': 'bulk', 'state': 'todo'}]
+        * size,
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_create_todos_in_bulk_with_invalid_state(client, token, session):
+    response = client.post(
+        '/todos/bulk',
+        json=[
+            {'title': 'task', 'description': 'bulk', 'state': 'todo'},
+            {'title': 'task', 'description': 'bulk', 'state': 'fazer'},
+        ],
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
 @pytest.mark.asyncio
 async def test_list_todos(client, token, user, session):
     expected_value = 5
@@ -82,6 +161,68 @@ async def test_list_todos_with_offset_and_limit_filters(
     assert len(response.json().get('todos')) == expected_value
 
 
+@pytest.mark.asyncio
+async def test_list_todos_with_cursor(
+    client, token, user, session, mock_db_time
+):
+    with mock_db_time(model=Todo):
+        todos = TodoFactory.create_batch(5, user_id=user.id)
+        session.add_all(todos)
+        await session.commit()
+
+    ids, cursor = [], None
+    while True:
+        response = client.get(
+            '/todos',
+            headers={'Authorization': f'Bearer {token}'},
+            params={'limit': 2, **({'cursor': cursor} if cursor else {})},
+        )
+        ids += [todo['id'] for todo in response.json()['todos']]
+        cursor = response.json()['next_cursor']
+
+        if cursor is None:
+            break
+
+    assert ids == [todo.id for todo in todos]
+
+
+@pytest.mark.asyncio
+async def test_list_todos_with_cursor_in_the_same_second(
+    client, token, user, session
+):
+    # um único INSERT: todas as linhas recebem o mesmo created_at do banco
+    session.add_all(TodoFactory.create_batch(5, user_id=user.id))
+    await session.commit()
+    created_at = await session.scalars(select(Todo.created_at).distinct())
+
+    ids, cursor = [], None
+    while True:
+        response = client.get(
+            '/todos',
+            headers={'Authorization': f'Bearer {token}'},
+            params={'limit': 2, **({'cursor': cursor} if cursor else {})},
+        )
+        ids += [todo['id'] for todo in response.json()['todos']]
+        cursor = response.json()['next_cursor']
+
+        if cursor is None:
+            break
+
+    assert len(created_at.all()) == 1
+    assert ids == [1, 2, 3, 4, 5]
+
+
+def test_list_todos_with_invalid_cursor(client, token):
+    response = client.get(
+        '/todos',
+        headers={'Authorization': f'Bearer {token}'},
+        params={'cursor': 'invalid'},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'invalid cursor'}
+
+
 @pytest.mark.asyncio
 async def test_list_todos_with_title_filter(client, token, user, session):
     expected_value = 5
@@ -174,6 +315,57 @@ async def test_list_todos_with_all_filters(client, token, user, session):
     assert len(response.json().get('todos')) == expected_value
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ('params', 'expected_titles'),
+    [
+        ({'title': 'Python'}, ['Python basics']),
+        ({'title': 'python'}, ['learn python']),
+        (
+            {'title': 'python', 'case_insensitive': True},
+            ['Python basics', 'learn python'],
+        ),
+        ({'title': 'Py'}, ['Python basics']),
+        (
+            {'title': 'PY', 'case_insensitive': True},
+            ['Python basics', 'learn python'],
+        ),
+        ({'title': '100%'}, ['100% done']),
+    ],
+)
+async def test_list_todos_with_text_search(  # noqa: PLR0913, PLR0917
+    client, token, user, session, params, expected_titles
+):
+    for title in ['Python basics', 'learn python', '100% done', '100 done']:
+        session.add(TodoFactory(user_id=user.id, title=title))
+    await session.commit()
+
+    response = client.get(
+        '/todos',
+        headers={'Authorization': f'Bearer {token}'},
+        params=params,
+    )
+
+    titles = [todo['title'] for todo in response.json()['todos']]
+
+    assert response.status_code == HTTPStatus.OK
+    assert titles == expected_titles
+
+
+def test_list_todos_text_search_after_update(client, token, todo):
+    headers = {'Authorization': f'Bearer {token}'}
+    old_title = todo.title
+    client.patch(
+        f'/todos/{todo.id}', json={'title': 'renamed'}, headers=headers
+    )
+
+    old = client.get('/todos', headers=headers, params={'title': old_title})
+    new = client.get('/todos', headers=headers, params={'title': 'renamed'})
+
+    assert old.json() == {'todos': [], 'next_cursor': None}
+    assert [t['id'] for t in new.json()['todos']] == [todo.id]
+
+
 def test_list_todos_with_invalid_state_filter(client, token, todo):
     response = client.get(
         '/todos',
@@ -241,3 +433,487 @@ def test_delete_todo_not_found(client, token, todo):
 
     assert response.status_code == HTTPStatus.NOT_FOUND
     assert response.json() == {'detail': 'todo not found'}
+
+
+@pytest_asyncio.fixture
+async def other_user_todo(session):
+    other_user = UserFactory()
+    session.add(other_user)
+    await session.commit()
+
+    todo = TodoFactory(user_id=other_user.id, state='trash')
+    session.add(todo)
+    await session.commit()
+
+    return todo
+
+
+@pytest.mark.asyncio
+async def test_update_todos_in_bulk_by_ids(client, token, user, session):
+    todos = TodoFactory.create_batch(3, user_id=user.id, state='todo')
+    session.add_all(todos)
+    await session.commit()
+    ids = [todo.id for todo in todos[:2]]
+
+    response = client.patch(
+        '/todos/bulk',
+        json={'ids': ids, 'state': 'done', 'return_ids': True},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+    done = await session.scalars(
+        select(Todo.id).where(Todo.state == 'done').order_by(Todo.id)
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'count': 2, 'ids': ids}
+    assert done.all() == ids
+
+
+@pytest.mark.asyncio
+async def test_update_todos_in_bulk_by_filter(  # noqa: PLR0913, PLR0917
+    client, token, user, session, other_user_todo
+):
+    session.add_all(
+        TodoFactory.create_batch(3, user_id=user.id, state='trash')
+    )
+    session.add(TodoFactory(user_id=user.id, state='doing'))
+    await session.commit()
+
+    response = client.patch(
+        '/todos/bulk',
+        json={'filter': {'state': 'trash'}, 'state': 'todo'},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+    await session.refresh(other_user_todo)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'count': 3, 'ids': None}
+    assert other_user_todo.state == 'trash'
+
+
+@pytest.mark.asyncio
+async def test_delete_todos_in_bulk_by_filter(  # noqa: PLR0913, PLR0917
+    client, token, user, session, other_user_todo
+):
+    session.add_all(
+        TodoFactory.create_batch(3, user_id=user.id, state='trash')
+    )
+    session.add(TodoFactory(user_id=user.id, state='doing'))
+    await session.commit()
+
+    response = client.request(
+        'DELETE',
+        '/todos/bulk',
+        json={'filter': {'state': 'trash'}},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+    remaining = await session.scalars(select(Todo.state).order_by(Todo.id))
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'count': 3, 'ids': None}
+    assert remaining.all() == ['trash', 'doing']
+
+
+@pytest.mark.asyncio
+async def test_delete_todos_in_bulk_by_title(client, token, user, session):
+    session.add(TodoFactory(user_id=user.id, title='groceries'))
+    session.add(TodoFactory(user_id=user.id, title='homework'))
+    await session.commit()
+
+    response = client.request(
+        'DELETE',
+        '/todos/bulk',
+        json={'filter': {'title': 'grocer'}, 'return_ids': True},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['count'] == 1
+
+
+def test_delete_todos_in_bulk_without_selection(client, token, todo):
+    response = client.request(
+        'DELETE',
+        '/todos/bulk',
+        json={},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'ids or filter required'}
+
+
+@pytest.mark.parametrize(
+    'filter', [{}, {'case_insensitive': True}, {'title': ''}]
+)
+def test_delete_todos_in_bulk_with_empty_filter(client, token, todo, filter):
+    response = client.request(
+        'DELETE',
+        '/todos/bulk',
+        json={'filter': filter},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {
+        'detail': 'filter requires at least one criterion'
+    }
+
+
+def test_update_todos_in_bulk_with_empty_filter(client, token, todo):
+    response = client.patch(
+        '/todos/bulk',
+        json={'filter': {}, 'state': 'done'},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {
+        'detail': 'filter requires at least one criterion'
+    }
+
+
+@pytest.mark.parametrize(
+    'pagination', [{'offset': 1}, {'limit': 1}, {'cursor': 'abc'}]
+)
+def test_delete_todos_in_bulk_rejects_pagination(
+    client, token, todo, pagination
+):
+    response = client.request(
+        'DELETE',
+        '/todos/bulk',
+        json={'filter': {'state': 'draft', **pagination}},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_export_todos_as_ndjson(client, token, user, session):
+    expected_todos = 5
+    session.add_all(TodoFactory.create_batch(expected_todos, user_id=user.id))
+    await session.commit()
+
+    response = client.get(
+        '/todos/export', headers={'Authorization': f'Bearer {token}'}
+    )
+    todos = [json.loads(line) for line in response.text.splitlines()]
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    assert len(todos) == expected_todos
+    assert set(todos[0]) == {
+        'id',
+        'title',
+        'description',
+        'state',
+        'createdAt',
+        'updatedAt',
+    }
+
+
+@pytest.mark.asyncio
+async def test_export_todos_as_csv(client, token, user, session, monkeypatch):
+    monkeypatch.setattr(settings, 'TODO_EXPORT_BATCH_SIZE', 2)
+    session.add_all(TodoFactory.create_batch(5, user_id=user.id))
+    await session.commit()
+
+    response = client.get(
+        '/todos/export?format=csv',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'].startswith('text/csv')
+    assert [int(row['id']) for row in rows] == [1, 2, 3, 4, 5]
+
+
+def test_export_todos_as_csv_without_todos(client, token):
+    response = client.get(
+        '/todos/export?format=csv',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.text.splitlines() == [
+        'title,description,state,id,createdAt,updatedAt'
+    ]
+
+
+@pytest.mark.asyncio
+async def test_import_todos_as_ndjson(client, token, session, monkeypatch):
+    monkeypatch.setattr(settings, 'TODO_IMPORT_CHUNK_SIZE', 2)
+    lines = [
+        json.dumps({'title': f'task {n}', 'description': 'x', 'state': 'todo'})
+        for n in range(5)
+    ]
+    lines.insert(2, '{"title": "broken"')
+    lines.insert(4, json.dumps({'title': 't', 'description': 'x'}))
+
+    response = client.post(
+        '/todos/import',
+        content='\n'.join(lines),
+        headers={'Authorization': f'Bearer {token}'},
+    )
+    titles = await session.scalars(select(Todo.title).order_by(Todo.id))
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['imported'] == 5  # noqa: PLR2004
+    assert response.json()['failed'] == 2  # noqa: PLR2004
+    assert [error['row'] for error in response.json()['errors']] == [3, 5]
+    assert response.json()['errors'][1]['errors'] == ['state: Field required']
+    assert titles.all() == [f'task {n}' for n in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_import_todos_as_csv(client, token, user, session):
+    session.add(
+        TodoFactory(user_id=user.id, description='multi\n"line"', state='done')
+    )
+    await session.commit()
+    exported = client.get(
+        '/todos/export?format=csv',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    response = client.post(
+        '/todos/import?format=csv',
+        content=exported.content,
+        headers={'Authorization': f'Bearer {token}'},
+    )
+    descriptions = await session.scalars(select(Todo.description))
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'imported': 1, 'failed': 0, 'errors': []}
+    assert descriptions.all() == ['multi\n"line"'] * 2
+
+
+def test_import_todos_as_csv_with_stray_quote(client, token):
+    body = '\n'.join([
+        'title,description,state',
+        'TV 5" screen,desc,todo',
+        'task 2,desc,todo',
+        'task 3,desc,todo',
+        'task 4,desc,todo',
+    ])
+
+    response = client.post(
+        '/todos/import?format=csv',
+        content=body,
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.json() == {'imported': 4, 'failed': 0, 'errors': []}
+
+
+def test_import_todos_as_csv_with_unterminated_quote(client, token):
+    body = '\n'.join([
+        'title,description,state',
+        'task 1,desc,todo',
+        'task 2,"desc,todo',
+        'task 3,desc,todo',
+    ])
+
+    response = client.post(
+        '/todos/import?format=csv',
+        content=body,
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.json() == {
+        'imported': 1,
+        'failed': 1,
+        'errors': [{'row': 2, 'errors': ['unterminated quoted field']}],
+    }
+
+
+def test_import_todos_as_csv_with_malformed_row(client, token):
+    body = '\n'.join([
+        'title,description,state',
+        '"task 1"x,desc,todo',
+        'task 2,desc,todo',
+    ])
+
+    response = client.post(
+        '/todos/import?format=csv',
+        content=body,
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.json()['imported'] == 1
+    assert [error['row'] for error in response.json()['errors']] == [1]
+
+
+def test_import_todos_limits_reported_errors(client, token, monkeypatch):
+    monkeypatch.setattr(settings, 'TODO_IMPORT_MAX_ERRORS', 2)
+
+    response = client.post(
+        '/todos/import',
+        content='\n'.join(['{}'] * 5),
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.json()['failed'] == 5  # noqa: PLR2004
+    assert len(response.json()['errors']) == 2  # noqa: PLR2004
+
+
+@pytest.mark.parametrize(
+    ('import_format', 'content'),
+    [
+        ('ndjson', '{"title": "' + 'x' * 100),
+        ('csv', 'title,description,state\n"' + 'x\n' * 50),
+    ],
+)
+def test_import_todos_rejects_oversized_record(
+    client, token, monkeypatch, import_format, content
+):
+    monkeypatch.setattr(settings, 'TODO_IMPORT_MAX_RECORD_SIZE', 64)
+
+    response = client.post(
+        '/todos/import',
+        params={'format': import_format},
+        content=content,
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+    assert response.json() == {'detail': 'import record too large'}
+
+
+@pytest.mark.asyncio
+async def test_list_todo_changes(client, token, user, session, mock_db_time):
+    with mock_db_time(model=Todo):
+        todos = TodoFactory.create_batch(3, user_id=user.id)
+        session.add_all(todos)
+        await session.commit()
+    updated, deleted, _ = todos
+    headers = {'Authorization': f'Bearer {token}'}
+
+    first_sync = client.get('/todos/changes', headers=headers)
+    client.patch(
+        f'/todos/{updated.id}', json={'title': 'changed'}, headers=headers
+    )
+    client.delete(f'/todos/{deleted.id}', headers=headers)
+    response = client.get(
+        '/todos/changes',
+        params={'since': first_sync.json()['next_token']},
+        headers=headers,
+    )
+
+    assert len(first_sync.json()['todos']) == len(todos)
+    assert first_sync.json()['deleted'] == []
+    assert response.status_code == HTTPStatus.OK
+    assert [todo['title'] for todo in response.json()['todos']] == ['changed']
+    assert response.json()['deleted'] == [deleted.id]
+
+
+@pytest.mark.asyncio
+async def test_list_todo_changes_after_bulk_delete(client, token, todo):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    first_sync = client.get('/todos/changes', headers=headers)
+    client.request(
+        'DELETE', '/todos/bulk', json={'ids': [todo.id]}, headers=headers
+    )
+    response = client.get(
+        '/todos/changes',
+        params={'since': first_sync.json()['next_token']},
+        headers=headers,
+    )
+
+    assert response.json()['deleted'] == [todo.id]
+
+
+def test_list_todo_changes_uses_database_clock(client, token, monkeypatch):
+    skewed = utcnow() + timedelta(hours=1)
+    monkeypatch.setattr('fast_zero.todo.service.utcnow', lambda: skewed)
+
+    response = client.get(
+        '/todos/changes', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert decode_sync_token(response.json()['next_token']) < skewed
+
+
+def test_list_todo_changes_with_expired_token(client, token):
+    since = utcnow() - timedelta(
+        seconds=settings.TODO_TOMBSTONE_RETENTION_SECS + 60
+    )
+
+    response = client.get(
+        '/todos/changes',
+        params={'since': encode_sync_token(since)},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.GONE
+
+
+@pytest.mark.parametrize(
+    'since',
+    ['invalid', encode_sync_token(datetime(2025, 1, 1, tzinfo=UTC))],
+)
+def test_list_todo_changes_with_invalid_token(client, token, since):
+    response = client.get(
+        '/todos/changes',
+        params={'since': since},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'invalid sync token'}
+
+
+@pytest.mark.asyncio
+async def test_list_archived_todos(  # noqa: PLR0913, PLR0917
+    client, token, user, session, mock_db_time
+):
+    expected_todos = 3
+
+    with mock_db_time(model=Todo, time=datetime(2025, 1, 1)):
+        session.add_all(
+            TodoFactory.create_batch(
+                expected_todos, user_id=user.id, state='trash'
+            )
+        )
+        await session.commit()
+    await archive_trash_todos(session, timedelta(days=30), batch_size=10)
+
+    response = client.get(
+        '/todos/archive', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.json()['todos']) == expected_todos
+    assert all('archivedAt' in todo for todo in response.json()['todos'])
+
+
+@pytest.mark.asyncio
+async def test_restore_archived_todo(
+    client, token, user, session, mock_db_time
+):
+    with mock_db_time(model=Todo, time=datetime(2025, 1, 1)):
+        todo = TodoFactory(user_id=user.id, state='trash')
+        session.add(todo)
+        await session.commit()
+    await archive_trash_todos(session, timedelta(days=30), batch_size=10)
+
+    response = client.post(
+        f'/todos/archive/{todo.id}/restore',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['id'] == todo.id
+    assert response.json()['state'] == 'todo'
+
+
+def test_restore_archived_todo_not_found(client, token):
+    response = client.post(
+        '/todos/archive/10/restore',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == {'detail': 'todo not found'}
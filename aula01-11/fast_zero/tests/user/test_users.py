@@ -1,9 +1,13 @@
 from http import HTTPStatus
 
 import pytest
+from sqlalchemy import func, select
 
+from fast_zero.auth.security import create_access_token
+from fast_zero.todo.models import Todo
+from fast_zero.user.models import User
 from fast_zero.user.schemas import UserResponse
-from tests.conftest import UserFactory
+from tests.conftest import TodoFactory, UserFactory
 
 
 def test_create_user(client):
@@ -25,6 +29,24 @@ def test_create_user(client):
     }
 
 
+def test_create_user_in_one_statement(client, statements):
+    response = client.post(
+        '/users',
+        json={
+            'username': 'diego',
+            'email': 'diego@email.com',
+            'password': '123@asd',
+        },
+    )
+
+    user_statements = [s for s in statements if 'users' in s or 'todos' in s]
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert len(user_statements) == 1
+    assert user_statements[0].startswith('INSERT INTO users')
+    assert 'RETURNING' in user_statements[0]
+
+
 def test_create_user_with_already_in_use_username(client, user):
     response = client.post(
         '/users',
@@ -53,12 +75,21 @@ def test_create_user_with_already_in_use_email(client, user):
     assert response.json() == {'detail': 'username or email already in use'}
 
 
-def test_list_users(client, user):
+@pytest.mark.asyncio
+async def test_list_users(client, user, session):
+    await session.refresh(user, ['todos'])
     user_schema = UserResponse.model_validate(user).model_dump()
     response = client.get('/users')
 
     assert response.status_code == HTTPStatus.OK
-    assert response.json() == {'users': [user_schema]}
+    assert response.json() == {'users': [user_schema], 'next_cursor': None}
+
+
+def test_list_users_with_todos(client, user, todo):
+    response = client.get('/users')
+
+    assert response.status_code == HTTPStatus.OK
+    assert [t['id'] for t in response.json()['users'][0]['todos']] == [todo.id]
 
 
 @pytest.mark.asyncio
@@ -103,6 +134,26 @@ async def test_list_users_with_offset_and_limit_filter(client, session):
     assert len(response.json().get('users')) == expected_users
 
 
+@pytest.mark.asyncio
+async def test_list_users_with_cursor(client, session, mock_db_time):
+    with mock_db_time(model=User):
+        users = UserFactory.create_batch(3)
+        session.add_all(users)
+        await session.commit()
+
+    first_page = client.get('/users', params={'limit': 2}).json()
+    second_page = client.get(
+        '/users', params={'limit': 2, 'cursor': first_page['next_cursor']}
+    ).json()
+
+    assert [u['id'] for u in first_page['users']] == [
+        users[0].id,
+        users[1].id,
+    ]
+    assert [u['id'] for u in second_page['users']] == [users[2].id]
+    assert second_page['next_cursor'] is None
+
+
 def test_get_user_by_id(client, user, token):
     response = client.get(
         f'/users/{user.id}',
@@ -113,6 +164,42 @@ def test_get_user_by_id(client, user, token):
     assert response.json().get('id') == user.id
 
 
+def test_get_user_by_id_with_todos(client, user, token, todo):
+    response = client.get(
+        f'/users/{user.id}',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert [t['id'] for t in response.json().get('todos')] == [todo.id]
+
+
+def test_get_user_by_id_with_token_without_uid(client, user):
+    token, _ = create_access_token(data={'sub': user.email})
+
+    response = client.get(
+        f'/users/{user.id}',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert response.json() == {'detail': 'Could not validate credentials'}
+
+
+@pytest.mark.asyncio
+async def test_get_user_by_id_with_deleted_user(client, user, token, session):
+    await session.delete(user)
+    await session.commit()
+
+    response = client.get(
+        f'/users/{user.id}',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert response.json() == {'detail': 'Could not validate credentials'}
+
+
 def test_get_user_by_id_with_no_permissions(client, token):
     response = client.get(
         '/users/23',
@@ -144,6 +231,24 @@ def test_update_user(client, user, token):
     }
 
 
+def test_update_user_invalidates_principal_cache(client, user, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    client.get('/todos', headers=headers)
+
+    client.put(
+        f'/users/{user.id}',
+        json={
+            'username': 'updated_user',
+            'email': 'updated_user@email.com',
+            'password': '123@123',
+        },
+        headers=headers,
+    )
+    response = client.get('/todos', headers=headers)
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
 def test_update_user_with_no_permissions(client, token):
     response = client.put(
         '/users/12',
@@ -212,6 +317,37 @@ def test_delete_user(client, user, token):
     assert response.status_code == HTTPStatus.NO_CONTENT
 
 
+@pytest.mark.asyncio
+async def test_delete_user_cascades_to_todos_in_one_statement(
+    client, user, token, session, statements
+):
+    session.add_all(TodoFactory.create_batch(5, user_id=user.id))
+    await session.commit()
+
+    response = client.delete(
+        f'/users/{user.id}',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    todos = await session.scalar(select(func.count(Todo.id)))
+    deletes = [s for s in statements if s.startswith('DELETE')]
+
+    assert response.status_code == HTTPStatus.NO_CONTENT
+    assert len(deletes) == 1
+    assert deletes[0].startswith('DELETE FROM users')
+    assert not todos
+
+
+def test_delete_user_invalidates_principal_cache(client, user, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    client.get('/todos', headers=headers)
+
+    client.delete(f'/users/{user.id}', headers=headers)
+    response = client.get('/todos', headers=headers)
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
 def test_delete_user_with_no_permissions(client, token):
     response = client.delete(
         '/users/12',